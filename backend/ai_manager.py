@@ -6,7 +6,11 @@ Save this file as: backend/ai_manager.py
 import sys
 import os
 import time
-sys.path.append(os.path.join(os.path.dirname(__file__), 'tournament_system'))
+import random
+import threading
+tournament_dir = os.path.join(os.path.dirname(__file__), 'tournament_system')
+if tournament_dir not in sys.path:
+    sys.path.append(tournament_dir)
 
 from agents.mcts_minimax_random import MCTSStandardAgent, MinimaxAgent, RandomAgent
 from agents.heuristic_agent import HeuristicAgent
@@ -18,7 +22,18 @@ from agents.heuristics_roles_l3 import HeuristicRoleBased
 class AIManager:
     """Manages AI agents for the game"""
     
-    def __init__(self):
+    # Every session gets its own minimax search, so its transposition table is
+    # kept small: about 300 bytes per entry, up to SESSION_CACHE_SIZE sessions
+    SESSION_TT_ENTRIES = 1000
+    
+    def __init__(self, move_timeout=5.0):
+        """
+        Args:
+            move_timeout: Time budget in seconds for each AI reply (a whole chain
+                of consecutive moves shares it)
+        """
+        self.move_timeout = move_timeout
+        
         # Define agent configurations for each level and difficulty
         # Based on your tournament rankings
         self.agent_configs = {
@@ -71,6 +86,45 @@ class AIManager:
                 }
             }
         }
+        
+        # One pre-built agent per (level, difficulty). Sessions get a spawn()ed
+        # copy that shares its weights and static tables but has its own
+        # search state, so agents never need to be locked across sessions.
+        self._prototypes = {}
+        self._prototype_lock = threading.Lock()
+        
+        # Stateless random agents used when an agent can't be built
+        self._fallback_randoms = {
+            level: RandomAgent(name=f"Fallback_Random_L{level}", level=level)
+            for level in self.agent_configs
+        }
+        
+        # Build the prototypes in the background so startup isn't delayed
+        threading.Thread(target=self._prewarm_agents, daemon=True).start()
+    
+    def _prewarm_agents(self):
+        """Build the prototype agent for every configured level and difficulty"""
+        for level, difficulties in self.agent_configs.items():
+            for difficulty in difficulties:
+                try:
+                    self._get_prototype(level, difficulty)
+                except Exception as e:
+                    print(f"Error prewarming agent for level {level} {difficulty}: {e}")
+    
+    def _get_prototype(self, level, difficulty):
+        """
+        Get (building it on first use) the shared agent for a configuration
+        
+        Returns:
+            The prototype agent; never handed to a session directly
+        """
+        key = (level, difficulty)
+        with self._prototype_lock:
+            agent = self._prototypes.get(key)
+            if agent is None:
+                agent = self._create_agent(level, self.agent_configs[level][difficulty])
+                self._prototypes[key] = agent
+        return agent
     
     def get_agent(self, level, difficulty):
         """
@@ -90,67 +144,81 @@ class AIManager:
             raise ValueError(f"Invalid difficulty for level {level}: {difficulty}")
         
         config = self.agent_configs[level][difficulty]
-        agent_type = config['type']
         
         try:
-            if agent_type == 'random':
-                return RandomAgent(name=config['name'], level=level)
-            
-            elif agent_type == 'heuristic':
-                return HeuristicAgent(name=config['name'], level=level)
-            
-            elif agent_type == 'heuristic_advanced':
-                return HeuristicAgentLevel2(
-                    name=config['name'],
-                    level=level,
-                    advanced=True
-                )
-
-            elif agent_type == 'RoleBased':
-                return HeuristicRoleBased(
-                    name=config['name'],
-                    level=level,
-                    playstyle=config['playstyle']
-                )
-            
-            elif agent_type == 'territorial':
-                return HeuristicTerritorialControl(
-                    name=config['name'],
-                    level=level,
-                    pressure_intensity=config['pressure']
-                )
-            
-            elif agent_type == 'minimax':
-                # Build the full path to the weights file
-                weights_path = os.path.join(
-                    os.path.dirname(__file__),
-                    'tournament_system',
-                    config['weights_file']
-                )
-                return MinimaxAgent(
-                    name=config['name'],
-                    level=level,
-                    weights_file=weights_path
-                )
-            
-            elif agent_type == 'mcts':
-                return MCTSStandardAgent(
-                    name=config['name'],
-                    level=level,
-                    iterations=config.get('iterations', 100),
-                    exploration_constant=2.0,
-                    num_threads=1,  # Single thread for web to avoid issues
-                    use_opening_book=True
-                )
-            
-            else:
-                raise ValueError(f"Unknown agent type: {agent_type}")
-                
+            return self._get_prototype(level, difficulty).spawn()
         except Exception as e:
             print(f"Error creating agent {config['name']}: {e}")
             print(f"Falling back to random agent")
             # Fallback to random agent if there's any error
-            return RandomAgent(name=f"Fallback_Random_L{level}", level=level)
+            return self._fallback_randoms[level]
+    
+    def _create_agent(self, level, config):
+        """
+        Build a new agent instance from its configuration
+        
+        Args:
+            level: Game level (1, 2, or 3)
+            config: Agent configuration entry from agent_configs
+            
+        Returns:
+            A freshly initialized agent instance
+        """
+        agent_type = config['type']
+        
+        if agent_type == 'random':
+            return RandomAgent(name=config['name'], level=level)
+        
+        elif agent_type == 'heuristic':
+            return HeuristicAgent(name=config['name'], level=level)
+        
+        elif agent_type == 'heuristic_advanced':
+            return HeuristicAgentLevel2(
+                name=config['name'],
+                level=level,
+                advanced=True
+            )
+
+        elif agent_type == 'RoleBased':
+            return HeuristicRoleBased(
+                name=config['name'],
+                level=level,
+                playstyle=config['playstyle']
+            )
+        
+        elif agent_type == 'territorial':
+            return HeuristicTerritorialControl(
+                name=config['name'],
+                level=level,
+                pressure_intensity=config['pressure']
+            )
+        
+        elif agent_type == 'minimax':
+            # Build the full path to the weights file
+            weights_path = os.path.join(
+                os.path.dirname(__file__),
+                'tournament_system',
+                config['weights_file']
+            )
+            return MinimaxAgent(
+                name=config['name'],
+                level=level,
+                weights_file=weights_path,
+                max_tt_entries=self.SESSION_TT_ENTRIES
+            )
+        
+        elif agent_type == 'mcts':
+            return MCTSStandardAgent(
+                name=config['name'],
+                level=level,
+                iterations=config.get('iterations', 100),
+                exploration_constant=2.0,
+                num_threads=1,  # Single thread for web to avoid issues
+                use_opening_book=True
+            )
+        
+        else:
+            raise ValueError(f"Unknown agent type: {agent_type}")
     
     def get_ai_move(self, agent, game, team):
         """
@@ -169,8 +237,8 @@ class AIManager:
             if hasattr(agent, 'set_team'):
                 agent.set_team(team)
             
-            # Get move with 5 second timeout for web performance
-            move, thinking_time = agent.get_move(game, time_limit=5.0)
+            # Get move within the configured timeout for web performance
+            move, thinking_time = agent.get_move(game, time_limit=self.move_timeout)
             
             print(f"AI {agent.name} took {thinking_time:.2f}s to decide")
             
@@ -179,7 +247,6 @@ class AIManager:
         except Exception as e:
             print(f"Error getting AI move from {agent.name}: {e}")
             # Return a random legal move as fallback
-            import random
             legal_moves = game.get_legal_moves()
             if legal_moves:
                 fallback_move = random.choice(legal_moves)
@@ -187,6 +254,53 @@ class AIManager:
                 return fallback_move
             return None
     
+    def get_ai_move_chain(self, agent, game, team, status_check=None, max_moves=10):
+        """
+        Let the AI play all of its consecutive moves (passes, extra turns)
+        
+        Args:
+            agent: The AI agent instance
+            game: Current game state; moves are applied to it
+            team: Team the AI is playing as ('LEFT' or 'RIGHT')
+            status_check: Optional callable(game) -> {'ended', 'winner'} run after
+                each move; the chain stops as soon as it reports the game ended
+            max_moves: Safety cap to avoid infinite loops due to unexpected states
+            
+        Returns:
+            (moves, game_status): list of applied move tuples and the status of
+            the final position (None if no status_check was given)
+        """
+        if hasattr(agent, 'set_team'):
+            agent.set_team(team)
+        
+        # The check after the last move already describes the final position,
+        # so keep its result instead of checking again afterwards
+        game_status = None
+        stop_condition = None
+        if status_check is not None:
+            def stop_condition(g):
+                nonlocal game_status
+                game_status = status_check(g)
+                return game_status['ended']
+        
+        start_time = time.time()
+        # One deadline for the whole reply; moves still owed after it are played
+        # without searching so the request can't run over
+        moves = agent.get_move_chain(
+            game, team,
+            time_limit=self.move_timeout,
+            max_moves=max_moves,
+            stop_condition=stop_condition
+        )
+        
+        print(f"AI {agent.name} played {len(moves)} move(s) in {time.time() - start_time:.2f}s")
+        
+        if status_check is not None and game_status is None:
+            # No move was played
+            game_status = status_check(game)
+        
+        return moves, game_status
+    
     def get_available_agents(self):
         """
         Get list of all available agents organized by level and difficulty
@@ -207,6 +321,16 @@ class AIManager:
         
         return available
     
+    # Human-readable descriptions by agent type
+    AGENT_DESCRIPTIONS = {
+        'random': 'Makes random legal moves - Good for beginners',
+        'heuristic': 'Rule-based strategic play - Balanced difficulty',
+        'heuristic_advanced': 'Advanced multi-factor heuristic with weighted scoring - Challenging',
+        'territorial': 'Territorial control and pressure strategy - Zone domination',
+        'minimax': 'Minimax algorithm with evolutionary weights - Strong tactical play',
+        'mcts': 'Monte Carlo Tree Search algorithm - Very strong strategic play'
+    }
+    
     def _get_agent_description(self, agent_type):
         """
         Get human-readable description for agent type
@@ -217,15 +341,7 @@ class AIManager:
         Returns:
             Description string
         """
-        descriptions = {
-            'random': 'Makes random legal moves - Good for beginners',
-            'heuristic': 'Rule-based strategic play - Balanced difficulty',
-            'heuristic_advanced': 'Advanced multi-factor heuristic with weighted scoring - Challenging',
-            'territorial': 'Territorial control and pressure strategy - Zone domination',
-            'minimax': 'Minimax algorithm with evolutionary weights - Strong tactical play',
-            'mcts': 'Monte Carlo Tree Search algorithm - Very strong strategic play'
-        }
-        return descriptions.get(agent_type, 'AI agent')
+        return self.AGENT_DESCRIPTIONS.get(agent_type, 'AI agent')
 
 
 # Test function to verify AI manager works
@@ -5,21 +5,30 @@ Handles game management and AI agent integration
 
 import os
 import sys
-import json
+import copy
+import orjson
+import time
 import uuid
+import threading
 import traceback
 from datetime import datetime
-from flask import Flask, request, jsonify
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, request
 from flask_cors import CORS
 from werkzeug.exceptions import BadRequest
 
-# Add tournament system to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'tournament_system'))
+# Add tournament system to path (once, even if another module already did)
+tournament_dir = os.path.join(os.path.dirname(__file__), 'tournament_system')
+if tournament_dir not in sys.path:
+    sys.path.append(tournament_dir)
 
 # Import game manager and AI manager
-from game_manager import GameManager
+from game_manager import GameManager, make_status_checker
 from ai_manager import AIManager
 from config import Config
+from session_store import GameSession, SessionStore
 
 # Create Flask app
 app = Flask(__name__)
@@ -34,17 +43,184 @@ CORS(app, resources={
     }
 })
 
+def ojsonify(obj):
+    """Build a JSON response with orjson (drop-in replacement for flask.jsonify)"""
+    # All payload keys are strings, so orjson's slower OPT_NON_STR_KEYS path is not needed
+    return app.response_class(
+        orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY),
+        mimetype='application/json'
+    )
+
 # Initialize managers
 game_manager = GameManager()
-ai_manager = AIManager()
+ai_manager = AIManager(move_timeout=Config.AI_MOVE_TIMEOUT)
+
+# Agent configs never change after startup, so /api/agents is encoded once
+AGENTS_RESPONSE = orjson.dumps({'agents': ai_manager.get_available_agents()})
+
+# Background AI computation so move requests don't block a worker thread
+ai_executor = ThreadPoolExecutor(max_workers=Config.AI_WORKER_THREADS)
+
+# Store active games: in-process LRU, backed by Redis when REDIS_URL is set
+active_games = SessionStore(
+    ai_manager,
+    max_local_sessions=Config.SESSION_CACHE_SIZE,
+    redis_url=Config.REDIS_URL,
+    ttl_seconds=Config.GAME_TIMEOUT_MINUTES * 60
+)
+
+def _evict_loop():
+    """Background sweeper: drop idle sessions and finished games to bound memory"""
+    while True:
+        time.sleep(Config.SESSION_SWEEP_INTERVAL_SECONDS)
+        try:
+            evicted = active_games.evict_idle(
+                idle_seconds=Config.GAME_TIMEOUT_MINUTES * 60,
+                completed_seconds=Config.COMPLETED_GAME_TIMEOUT_MINUTES * 60
+            )
+            if evicted:
+                app.logger.info(f"Evicted {evicted} idle game session(s)")
+        except Exception as e:
+            app.logger.error(f"Error evicting sessions: {str(e)}")
+
+threading.Thread(target=_evict_loop, daemon=True).start()
+
+def _format_moves(moves):
+    """
+    Turn stored move records into API payloads
+
+    Records keep a raw 'ts_ns' (wall clock, so it stays valid when a session
+    moves between workers); the ISO 'timestamp' is only built for moves that
+    are actually sent.
+    """
+    formatted = []
+    for move in moves:
+        payload = dict(move)
+        ts_ns = payload.pop('ts_ns', None)
+        if ts_ns is not None:
+            payload['timestamp'] = datetime.utcfromtimestamp(ts_ns / 1e9).isoformat()
+        formatted.append(payload)
+    return formatted
+
+def _game_status(session, game=None):
+    """Check game end using the session's win/turn overrides (on session.game by default)"""
+    checker = make_status_checker(session.win_goals, session.max_turns_enabled, session.max_turns)
+    return checker(session.game if game is None else game)
+
+def _play_ai_chain(session, game):
+    """
+    Let the AI play on game until the turn passes or the game ends
+
+    Returns:
+        (moves, game_status): applied move tuples and the final status
+    """
+    # Search, apply and end-of-game detection happen in one call
+    return ai_manager.get_ai_move_chain(
+        session.ai_agent, game, session.ai_color,
+        status_check=lambda g: _game_status(session, g)
+    )
+
+def _record_ai_chain(session, moves, game_status):
+    """
+    Record AI moves in the session history and mark the session completed
+    if the game ended (the caller holds the session lock)
+
+    Returns:
+        List of move records (see _format_moves)
+    """
+    ai_color = session.ai_color
+    ai_moves = []
+    for ai_move_type, ai_from_pos, ai_to_pos in moves:
+        payload = {
+            'player': ai_color,
+            'moveType': ai_move_type,
+            'from': {'row': ai_from_pos.row, 'col': ai_from_pos.col},
+            'to': {'row': ai_to_pos.row, 'col': ai_to_pos.col},
+            'ts_ns': time.time_ns()
+        }
+        session.move_history.append(payload)
+        ai_moves.append(payload)
+
+    if game_status['ended']:
+        session.status = 'completed'
+        session.winner = game_status['winner']
 
-# Store active games (in production, use Redis or database)
-active_games = {}
+    return ai_moves
+
+def _run_ai_chain(session):
+    """
+    Let the AI play on the live game (the caller holds the session lock)
+
+    Returns:
+        (ai_moves, game_status): list of move records (see _format_moves) and the final status
+    """
+    moves, game_status = _play_ai_chain(session, session.game)
+    return _record_ai_chain(session, moves, game_status), game_status
+
+def _compute_ai_chain(game_id, task_id):
+    """Background task: run the AI chain and store the result on the session"""
+    session_lock = active_games.lock(game_id)
+    moves = None
+    try:
+        # Search on a copy so requests never see a half-played chain; the
+        # finished game and its moves are swapped in together under the lock
+        with session_lock:
+            session = active_games.get(game_id)
+            if session is None or session.ai_task_id != task_id:
+                return
+            game = copy.deepcopy(session.game)
+        moves, game_status = _play_ai_chain(session, game)
+    except Exception as e:
+        app.logger.error(f"Error computing AI moves: {str(e)}\n{traceback.format_exc()}")
+        moves = None
+
+    with session_lock:
+        # Re-load: the stored session may have changed while the AI was thinking
+        session = active_games.get(game_id)
+        if session is None or session.ai_task_id != task_id:
+            # Removed or restarted in the meantime; the result is stale
+            return
+        try:
+            if moves is not None:
+                session.game = game
+                ai_moves = _record_ai_chain(session, moves, game_status)
+                session.ai_result = {
+                    'taskId': task_id,
+                    'aiMoves': ai_moves,
+                    'gameEnded': game_status['ended'],
+                    'winner': game_status.get('winner')
+                }
+            else:
+                session.ai_result = {
+                    'taskId': task_id,
+                    'aiMoves': [],
+                    'gameEnded': False,
+                    'winner': None,
+                    'error': 'Failed to compute AI moves'
+                }
+        finally:
+            session.ai_pending = False
+            active_games.put(game_id, session)
+
+def _submit_ai_chain(game_id, session):
+    """
+    Queue the AI chain for a session on the background executor
+
+    Returns:
+        The task id reported back to the client
+    """
+    task_id = str(uuid.uuid4())
+    session.ai_pending = True
+    session.ai_task_id = task_id
+    session.ai_result = None
+    active_games.put(game_id, session)
+    ai_executor.submit(_compute_ai_chain, game_id, task_id)
+    return task_id
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint for monitoring"""
-    return jsonify({
+    return ojsonify({
         'status': 'healthy',
         'timestamp': datetime.utcnow().isoformat(),
         'active_games': len(active_games)
@@ -67,13 +243,13 @@ def new_game():
         max_turns = data.get('maxTurns')
         
         if level not in [1, 2, 3]:
-            return jsonify({'error': 'Invalid level'}), 400
+            return ojsonify({'error': 'Invalid level'}), 400
         
         if difficulty not in ['easy', 'medium', 'hard']:
-            return jsonify({'error': 'Invalid difficulty'}), 400
+            return ojsonify({'error': 'Invalid difficulty'}), 400
         
         if player_color not in ['LEFT', 'RIGHT']:
-            return jsonify({'error': 'Invalid player color'}), 400
+            return ojsonify({'error': 'Invalid player color'}), 400
         
         # Generate game ID
         game_id = str(uuid.uuid4())
@@ -89,28 +265,29 @@ def new_game():
             ai_color = 'RIGHT' if player_color == 'LEFT' else 'LEFT'
         
         # Store game session
-        active_games[game_id] = {
-            'game': game,
-            'ai_agent': ai_agent,
-            'ai_color': ai_color,
-            'player_color': player_color,
-            'level': level,
-            'difficulty': difficulty,
-            'timer_enabled': timer_enabled,
-            'timer_minutes': timer_minutes,
-            'mode': mode,
-            'max_turns_enabled': bool(max_turns_enabled),
-            'max_turns': int(max_turns) if (max_turns_enabled and isinstance(max_turns, (int, float))) else None,
-            'win_goals': 2,  # default: play to 2 goals unless overridden in future
-            'start_time': datetime.utcnow().isoformat(),
-            'move_history': [],
-            'status': 'active'
-        }
+        session = GameSession(
+            game=game,
+            ai_agent=ai_agent,
+            ai_color=ai_color,
+            player_color=player_color,
+            level=level,
+            difficulty=difficulty,
+            timer_enabled=timer_enabled,
+            timer_minutes=timer_minutes,
+            mode=mode,
+            max_turns_enabled=bool(max_turns_enabled),
+            max_turns=int(max_turns) if (max_turns_enabled and isinstance(max_turns, (int, float))) else None,
+            win_goals=2,  # default: play to 2 goals unless overridden in future
+            start_time=datetime.utcnow().isoformat(),
+            move_history=deque(maxlen=Config.MOVE_HISTORY_LIMIT),
+            status='active'
+        )
+        active_games[game_id] = session
         
         # Get initial game state
         game_state = game_manager.get_game_state(game)
         
-        return jsonify({
+        return ojsonify({
             'success': True,
             'gameId': game_id,
             'gameState': game_state,
@@ -118,333 +295,379 @@ def new_game():
             'aiColor': ai_color,
             'mode': mode,
             'maxTurnsEnabled': bool(max_turns_enabled),
-            'maxTurns': active_games[game_id]['max_turns']
+            'maxTurns': session.max_turns
         })
         
     except Exception as e:
         app.logger.error(f"Error creating game: {str(e)}")
-        return jsonify({'error': 'Failed to create game'}), 500
+        return ojsonify({'error': 'Failed to create game'}), 500
 
 @app.route('/api/game/<game_id>/state', methods=['GET'])
 def get_game_state(game_id):
     """Get current game state"""
-    if game_id not in active_games:
-        return jsonify({'error': 'Game not found'}), 404
-    
-    try:
-        session = active_games[game_id]
-        game = session['game']
-
-        # If it's AI's turn when fetching state, let AI play now so the client sees the move
-        last_ai_move_payload = None
-        ai_moves = []
-        if session.get('mode', 'pve') == 'pve' and session.get('ai_agent') is not None and game.current_team == session.get('ai_color'):
-            ai_agent = session['ai_agent']
-            chain_limit = 10
-            while game.current_team == session['ai_color'] and chain_limit > 0:
-                chain_limit -= 1
-                ai_move = ai_manager.get_ai_move(ai_agent, game, session['ai_color'])
-                if not ai_move:
-                    break
-                ai_move_type, ai_from_pos, ai_to_pos = ai_move
-                success, _ = game_manager.execute_move(
-                    game, ai_move_type,
-                    {'row': ai_from_pos.row, 'col': ai_from_pos.col},
-                    {'row': ai_to_pos.row, 'col': ai_to_pos.col}
-                )
-                if not success:
-                    break
-                last_ai_move_payload = {
-                    'player': session['ai_color'],
-                    'moveType': ai_move_type,
-                    'from': {'row': ai_from_pos.row, 'col': ai_from_pos.col},
-                    'to': {'row': ai_to_pos.row, 'col': ai_to_pos.col},
-                    'timestamp': datetime.utcnow().isoformat()
-                }
-                session['move_history'].append(last_ai_move_payload)
-                ai_moves.append(last_ai_move_payload)
-
-                # Stop chaining if game ends
-                game_status = game_manager.check_game_status(
-                    game,
-                    win_goals=session.get('win_goals'),
-                    max_turns_enabled=session.get('max_turns_enabled', False),
-                    max_turns=session.get('max_turns')
-                )
-                if game_status['ended']:
-                    session['status'] = 'completed'
-                    session['winner'] = game_status['winner']
-                    break
-
-        game_state = game_manager.get_game_state(game)
-        
-        return jsonify({
-            'success': True,
-            'gameState': game_state,
-            'status': session['status'],
-            'moveHistory': session['move_history'],
-            'aiMoves': ai_moves,
-            'lastAiMove': last_ai_move_payload
-        })
+    with active_games.lock(game_id):
+        session = active_games.get(game_id)
+        if session is None:
+            return ojsonify({'error': 'Game not found'}), 404
         
-    except Exception as e:
-        app.logger.error(f"Error getting game state: {str(e)}")
-        return jsonify({'error': 'Failed to get game state'}), 500
+        try:
+            game = session.game
+
+            # If it's AI's turn when fetching state, let AI play now so the client sees the move
+            ai_moves = []
+            if (session.mode == 'pve' and session.ai_agent is not None
+                    and game.current_team == session.ai_color and not session.ai_pending):
+                ai_moves, _ = _run_ai_chain(session)
+                active_games.put(game_id, session)
+            ai_moves = _format_moves(ai_moves)
+            last_ai_move_payload = ai_moves[-1] if ai_moves else None
+
+            # ?layout=soa returns players and legal moves as parallel arrays
+            layout = 'soa' if request.args.get('layout') == 'soa' else 'nested'
+            game_state = game_manager.get_game_state(game, layout=layout)
+            
+            return ojsonify({
+                'success': True,
+                'gameState': game_state,
+                'status': session.status,
+                'moveHistory': _format_moves(session.move_history),
+                'aiMoves': ai_moves,
+                'lastAiMove': last_ai_move_payload,
+                'aiPending': bool(session.ai_pending)
+            })
+            
+        except Exception as e:
+            app.logger.error(f"Error getting game state: {str(e)}")
+            return ojsonify({'error': 'Failed to get game state'}), 500
 
 @app.route('/api/game/<game_id>/move', methods=['POST'])
 def make_move(game_id):
     """Make a player move"""
-    if game_id not in active_games:
-        return jsonify({'error': 'Game not found'}), 404
-    
-    try:
-        session = active_games[game_id]
-        
-        if session['status'] != 'active':
-            return jsonify({'error': 'Game is not active'}), 400
-        
-        data = request.json
-        move_type = data.get('moveType')  # 'move' or 'kick'
-        from_pos = data.get('fromPos')  # {'row': x, 'col': y}
-        to_pos = data.get('toPos')  # {'row': x, 'col': y}
-        
-        if not all([move_type, from_pos, to_pos]):
-            return jsonify({'error': 'Invalid move data'}), 400
-        
-        # Enforce turn ownership: only the human player may call this endpoint
-        game = session['game']
-        if session.get('mode', 'pve') == 'pve':
-            if game.current_team != session.get('player_color'):
-                return jsonify({'error': 'Not your turn'}), 400
-        
-        # Execute player move
-        # Snapshot pre-move for extra-turn detection and goal detection
-        prev_team = game.current_team
-        prev_turn = game.turn_count
-        prev_level = game.level
-        prev_left_goals = game.LEFT_goals
-        prev_right_goals = game.RIGHT_goals
-
-        success, message = game_manager.execute_move(
-            game, move_type, from_pos, to_pos
-        )
+    with active_games.lock(game_id):
+        session = active_games.get(game_id)
+        if session is None:
+            return ojsonify({'error': 'Game not found'}), 404
         
-        if not success:
-            return jsonify({
-                'success': False,
-                'error': message
-            }), 400
-        
-        # Record move
-        session['move_history'].append({
-            'player': session['player_color'],
-            'moveType': move_type,
-            'from': from_pos,
-            'to': to_pos,
-            'timestamp': datetime.utcnow().isoformat()
-        })
-
-        # Detect if an extra turn was granted by special tile (level 3 rule)
-        extra_turn = False
         try:
-            if move_type == 'kick' and prev_level >= 3:
-                # Import here to avoid circular import issues
-                from position import Position as _Pos
-                to_pos_obj = _Pos(to_pos['row'], to_pos['col'])
-                # Use engine's helper to check if destination is a special tile for the moving team
-                if game.is_special_tile(to_pos_obj, prev_team):
-                    # If special tile was hit, rule grants an extra turn to the same team
-                    # Depending on whether it was a pass, current_team may remain the same immediately,
-                    # or be restored after internal end_turn handling. Either way, flag it.
-                    extra_turn = True
-        except Exception:
+            if session.status != 'active':
+                return ojsonify({'error': 'Game is not active'}), 400
+                
+            # The background AI chain owns the game until it finishes
+            if session.ai_pending:
+                return ojsonify({'error': 'AI is still thinking'}), 409
+            
+            data = request.json
+            move_type = data.get('moveType')  # 'move' or 'kick'
+            async_ai = bool(data.get('asyncAi', False))  # compute AI reply in background
+            from_pos = data.get('fromPos')  # {'row': x, 'col': y}
+            to_pos = data.get('toPos')  # {'row': x, 'col': y}
+            
+            if not all([move_type, from_pos, to_pos]):
+                return ojsonify({'error': 'Invalid move data'}), 400
+            
+            # Enforce turn ownership: only the human player may call this endpoint
+            game = session.game
+            if session.mode == 'pve':
+                if game.current_team != session.player_color:
+                    return ojsonify({'error': 'Not your turn'}), 400
+            
+            # Execute player move
+            # Snapshot pre-move for extra-turn detection and goal detection
+            prev_team = game.current_team
+            prev_turn = game.turn_count
+            prev_level = game.level
+            prev_left_goals = game.LEFT_goals
+            prev_right_goals = game.RIGHT_goals
+
+            success, message = game_manager.execute_move(
+                game, move_type, from_pos, to_pos
+            )
+            
+            if not success:
+                return ojsonify({
+                    'success': False,
+                    'error': message
+                }), 400
+            
+            # Record move
+            session.move_history.append({
+                'player': session.player_color,
+                'moveType': move_type,
+                'from': from_pos,
+                'to': to_pos,
+                'ts_ns': time.time_ns()
+            })
+
+            # Detect if an extra turn was granted by special tile (level 3 rule)
             extra_turn = False
-        
-        # Check game end with overrides
-        win_goals = session.get('win_goals')
-        max_turns_enabled = session.get('max_turns_enabled', False)
-        max_turns = session.get('max_turns')
-        game_status = game_manager.check_game_status(
-            game,
-            win_goals=win_goals,
-            max_turns_enabled=max_turns_enabled,
-            max_turns=max_turns
-        )
-        if game_status['ended']:
-            session['status'] = 'completed'
-            session['winner'] = game_status['winner']
+            try:
+                if move_type == 'kick' and prev_level >= 3:
+                    # Import here to avoid circular import issues
+                    from position import Position as _Pos
+                    to_pos_obj = _Pos(to_pos['row'], to_pos['col'])
+                    # Use engine's helper to check if destination is a special tile for the moving team
+                    if game.is_special_tile(to_pos_obj, prev_team):
+                        # If special tile was hit, rule grants an extra turn to the same team
+                        # Depending on whether it was a pass, current_team may remain the same immediately,
+                        # or be restored after internal end_turn handling. Either way, flag it.
+                        extra_turn = True
+            except Exception:
+                extra_turn = False
+            
+            # Check game end with overrides
+            game_status = _game_status(session)
+            if game_status['ended']:
+                session.status = 'completed'
+                session.winner = game_status['winner']
+                active_games.put(game_id, session)
+                
+                return ojsonify({
+                    'success': True,
+                    'gameState': game_manager.get_game_state(game),
+                    'gameEnded': True,
+                    'winner': game_status['winner'],
+                    'extraTurn': extra_turn,
+                    'goalScored': 'LEFT' if game.LEFT_goals > prev_left_goals else ('RIGHT' if game.RIGHT_goals > prev_right_goals else None)
+                })
+
+            # If the player's move scored a goal, do NOT immediately trigger AI; let client show goal modal
+            goal_scored = (game.LEFT_goals > prev_left_goals) or (game.RIGHT_goals > prev_right_goals)
+            if goal_scored:
+                active_games.put(game_id, session)
+                return ojsonify({
+                    'success': True,
+                    'gameState': game_manager.get_game_state(game),
+                    'gameEnded': False,
+                    'winner': None,
+                    'aiMoves': [],
+                    'lastAiMove': None,
+                    'extraTurn': extra_turn,
+                    'goalScored': 'LEFT' if game.LEFT_goals > prev_left_goals else 'RIGHT'
+                })
             
-            return jsonify({
+            # AI turn: allow chained AI actions until turn passes or game ends
+            ai_moves = []
+            # Do not trigger AI if an extra turn (special tile) was granted to the human
+            if game.current_team == session.ai_color and not extra_turn:
+                if async_ai:
+                    # Return right away; the client polls /ai-status for the AI moves
+                    task_id = _submit_ai_chain(game_id, session)
+                    return ojsonify({
+                        'success': True,
+                        'gameState': game_manager.get_game_state(game),
+                        'gameEnded': False,
+                        'winner': None,
+                        'aiMoves': [],
+                        'lastAiMove': None,
+                        'aiPending': True,
+                        'taskId': task_id,
+                        'extraTurn': extra_turn,
+                        'goalScored': None
+                    })
+                ai_moves, game_status = _run_ai_chain(session)
+                ai_moves = _format_moves(ai_moves)
+            
+            active_games.put(game_id, session)
+            
+            # Return updated state
+            return ojsonify({
                 'success': True,
                 'gameState': game_manager.get_game_state(game),
-                'gameEnded': True,
-                'winner': game_status['winner'],
+                'gameEnded': game_status['ended'],
+                'winner': game_status.get('winner'),
+                'aiMoves': ai_moves,
+                'lastAiMove': ai_moves[-1] if ai_moves else None,
                 'extraTurn': extra_turn,
-                'goalScored': 'LEFT' if game.LEFT_goals > prev_left_goals else ('RIGHT' if game.RIGHT_goals > prev_right_goals else None)
+                'goalScored': None
             })
+            
+        except Exception as e:
+            app.logger.error(f"Error making move: {str(e)}\n{traceback.format_exc()}")
+            return ojsonify({'error': 'Failed to make move'}), 500
 
-        # If the player's move scored a goal, do NOT immediately trigger AI; let client show goal modal
-        goal_scored = (game.LEFT_goals > prev_left_goals) or (game.RIGHT_goals > prev_right_goals)
-        if goal_scored:
-            return jsonify({
+@app.route('/api/game/<game_id>/ai-status', methods=['GET'])
+def get_ai_status(game_id):
+    """Poll the result of a background AI computation"""
+    with active_games.lock(game_id):
+        session = active_games.get(game_id)
+        if session is None:
+            return ojsonify({'error': 'Game not found'}), 404
+        
+        try:
+            if session.ai_pending:
+                return ojsonify({
+                    'success': True,
+                    'ready': False,
+                    'taskId': session.ai_task_id
+                })
+            
+            result = session.ai_result
+            if result is None:
+                return ojsonify({'error': 'No AI computation for this game'}), 404
+            
+            ai_moves = _format_moves(result['aiMoves'])
+            return ojsonify({
                 'success': True,
-                'gameState': game_manager.get_game_state(game),
-                'gameEnded': False,
-                'winner': None,
-                'aiMoves': [],
-                'lastAiMove': None,
-                'extraTurn': extra_turn,
-                'goalScored': 'LEFT' if game.LEFT_goals > prev_left_goals else 'RIGHT'
+                'ready': True,
+                'taskId': result['taskId'],
+                'gameState': game_manager.get_game_state(session.game),
+                'gameEnded': result['gameEnded'],
+                'winner': result['winner'],
+                'aiMoves': ai_moves,
+                'lastAiMove': ai_moves[-1] if ai_moves else None,
+                'error': result.get('error')
             })
+            
+        except Exception as e:
+            app.logger.error(f"Error getting AI status: {str(e)}")
+            return ojsonify({'error': 'Failed to get AI status'}), 500
+
+@app.route('/api/game/<game_id>/history', methods=['GET'])
+def get_move_history(game_id):
+    """Get a page of the move history (only the last MOVE_HISTORY_LIMIT moves are kept)"""
+    with active_games.lock(game_id):
+        session = active_games.get(game_id)
+        if session is None:
+            return ojsonify({'error': 'Game not found'}), 404
         
-        # AI turn: allow chained AI actions until turn passes or game ends
-        ai_moves = []
-        # Do not trigger AI if an extra turn (special tile) was granted to the human
-        if game.current_team == session['ai_color'] and not extra_turn:
-            ai_agent = session['ai_agent']
-            # Safety cap to avoid infinite loops due to unexpected states
-            chain_limit = 10
-            while game.current_team == session['ai_color'] and chain_limit > 0:
-                chain_limit -= 1
-                ai_move = ai_manager.get_ai_move(ai_agent, game, session['ai_color'])
-                if not ai_move:
-                    break
-                ai_move_type, ai_from_pos, ai_to_pos = ai_move
-                success, _ = game_manager.execute_move(
-                    game, ai_move_type,
-                    {'row': ai_from_pos.row, 'col': ai_from_pos.col},
-                    {'row': ai_to_pos.row, 'col': ai_to_pos.col}
-                )
-                if not success:
-                    break
-                payload = {
-                    'player': session['ai_color'],
-                    'moveType': ai_move_type,
-                    'from': {'row': ai_from_pos.row, 'col': ai_from_pos.col},
-                    'to': {'row': ai_to_pos.row, 'col': ai_to_pos.col},
-                    'timestamp': datetime.utcnow().isoformat()
-                }
-                session['move_history'].append(payload)
-                ai_moves.append(payload)
-                game_status = game_manager.check_game_status(
-                    game,
-                    win_goals=win_goals,
-                    max_turns_enabled=max_turns_enabled,
-                    max_turns=max_turns
-                )
-                if game_status['ended']:
-                    session['status'] = 'completed'
-                    session['winner'] = game_status['winner']
-                    break
-        
-        # Return updated state
-        return jsonify({
-            'success': True,
-            'gameState': game_manager.get_game_state(game),
-            'gameEnded': game_status['ended'],
-            'winner': game_status.get('winner'),
-            'aiMoves': ai_moves,
-            'lastAiMove': ai_moves[-1] if ai_moves else None,
-            'extraTurn': extra_turn,
-            'goalScored': None
-        })
-        
-    except Exception as e:
-        app.logger.error(f"Error making move: {str(e)}\n{traceback.format_exc()}")
-        return jsonify({'error': 'Failed to make move'}), 500
+        try:
+            offset = max(request.args.get('offset', 0, type=int), 0)
+            limit = min(max(request.args.get('limit', 50, type=int), 1), Config.MOVE_HISTORY_LIMIT)
+            
+            history = session.move_history
+            moves = _format_moves(islice(history, offset, offset + limit))
+            
+            return ojsonify({
+                'success': True,
+                'moves': moves,
+                'offset': offset,
+                'limit': limit,
+                'total': len(history)
+            })
+            
+        except Exception as e:
+            app.logger.error(f"Error getting move history: {str(e)}")
+            return ojsonify({'error': 'Failed to get move history'}), 500
 
 @app.route('/api/game/<game_id>/legal-moves', methods=['GET'])
 def get_legal_moves(game_id):
     """Get all legal moves for current player"""
-    if game_id not in active_games:
-        return jsonify({'error': 'Game not found'}), 404
-    
-    try:
-        session = active_games[game_id]
-        game = session['game']
-        
-        legal_moves = game_manager.get_legal_moves(game)
-        
-        return jsonify({
-            'success': True,
-            'legalMoves': legal_moves,
-            'currentTeam': game.current_team
-        })
+    with active_games.lock(game_id):
+        session = active_games.get(game_id)
+        if session is None:
+            return ojsonify({'error': 'Game not found'}), 404
         
-    except Exception as e:
-        app.logger.error(f"Error getting legal moves: {str(e)}")
-        return jsonify({'error': 'Failed to get legal moves'}), 500
+        try:
+            game = session.game
+            
+            # ?format=packed returns the compact 5-bytes-per-move encoding
+            if request.args.get('format') == 'packed':
+                packed, count = game_manager.get_legal_moves_packed(game)
+                return ojsonify({
+                    'success': True,
+                    'legalMovesPacked': packed,
+                    'count': count,
+                    'currentTeam': game.current_team
+                })
+            
+            legal_moves = game_manager.get_legal_moves(game)
+            
+            return ojsonify({
+                'success': True,
+                'legalMoves': legal_moves,
+                'currentTeam': game.current_team
+            })
+            
+        except Exception as e:
+            app.logger.error(f"Error getting legal moves: {str(e)}")
+            return ojsonify({'error': 'Failed to get legal moves'}), 500
 
 @app.route('/api/game/<game_id>/restart', methods=['POST'])
 def restart_game(game_id):
     """Restart a game with same settings"""
-    if game_id not in active_games:
-        return jsonify({'error': 'Game not found'}), 404
-    
-    try:
-        session = active_games[game_id]
-        
-        # Create new game with same settings
-        new_game = game_manager.create_game(session['level'])
-        new_ai_agent = None
-        if session.get('mode', 'pve') == 'pve':
-            new_ai_agent = ai_manager.get_agent(session['level'], session['difficulty'])
+    with active_games.lock(game_id):
+        session = active_games.get(game_id)
+        if session is None:
+            return ojsonify({'error': 'Game not found'}), 404
         
-        # Reset session
-        session['game'] = new_game
-        session['ai_agent'] = new_ai_agent
-        session['move_history'] = []
-        session['status'] = 'active'
-        session['start_time'] = datetime.utcnow().isoformat()
+        if session.ai_pending:
+            return ojsonify({'error': 'AI is still thinking'}), 409
         
-        if 'winner' in session:
-            del session['winner']
-        
-        return jsonify({
-            'success': True,
-            'gameState': game_manager.get_game_state(new_game)
-        })
-        
-    except Exception as e:
-        app.logger.error(f"Error restarting game: {str(e)}")
-        return jsonify({'error': 'Failed to restart game'}), 500
+        try:
+            # Create new game with same settings
+            new_game = game_manager.create_game(session.level)
+            new_ai_agent = None
+            if session.mode == 'pve':
+                new_ai_agent = session.ai_agent
+                if new_ai_agent is not None:
+                    # Reuse the agent: only per-game state is cleared, loaded
+                    # weights and opening books are kept
+                    new_ai_agent.reset()
+                else:
+                    new_ai_agent = ai_manager.get_agent(session.level, session.difficulty)
+            
+            # Reset session
+            session.game = new_game
+            session.ai_agent = new_ai_agent
+            session.move_history = deque(maxlen=Config.MOVE_HISTORY_LIMIT)
+            session.status = 'active'
+            session.start_time = datetime.utcnow().isoformat()
+            
+            session.winner = None
+            session.ai_task_id = None
+            session.ai_result = None
+            
+            active_games.put(game_id, session)
+            
+            return ojsonify({
+                'success': True,
+                'gameState': game_manager.get_game_state(new_game)
+            })
+            
+        except Exception as e:
+            app.logger.error(f"Error restarting game: {str(e)}")
+            return ojsonify({'error': 'Failed to restart game'}), 500
 
 @app.route('/api/agents', methods=['GET'])
 def get_available_agents():
     """Get list of available AI agents by level and difficulty"""
-    return jsonify({
-        'agents': ai_manager.get_available_agents()
-    })
+    return app.response_class(AGENTS_RESPONSE, mimetype='application/json')
 
 @app.route('/api/statistics', methods=['GET'])
 def get_statistics():
     """Get game statistics"""
+    # One pass over small per-game summaries, not the pickled sessions
+    summaries = active_games.summaries()
     stats = {
-        'totalGames': len(active_games),
-        'activeGames': sum(1 for g in active_games.values() if g['status'] == 'active'),
-        'completedGames': sum(1 for g in active_games.values() if g['status'] == 'completed'),
+        'totalGames': len(summaries),
+        'activeGames': 0,
+        'completedGames': 0,
         'levelDistribution': {},
         'difficultyDistribution': {}
     }
     
-    for session in active_games.values():
-        level = f"level_{session['level']}"
+    for status, level, diff in summaries:
+        if status == 'active':
+            stats['activeGames'] += 1
+        elif status == 'completed':
+            stats['completedGames'] += 1
+        
+        level = f"level_{level}"
         stats['levelDistribution'][level] = stats['levelDistribution'].get(level, 0) + 1
         
-        diff = session['difficulty']
         stats['difficultyDistribution'][diff] = stats['difficultyDistribution'].get(diff, 0) + 1
     
-    return jsonify(stats)
+    return ojsonify(stats)
 
 # Error handlers
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({'error': 'Endpoint not found'}), 404
+    return ojsonify({'error': 'Endpoint not found'}), 404
 
 @app.errorhandler(500)
 def internal_error(error):
     app.logger.error(f"Internal error: {str(error)}")
-    return jsonify({'error': 'Internal server error'}), 500
+    return ojsonify({'error': 'Internal server error'}), 500
 
 if __name__ == '__main__':
     # For local development
@@ -20,9 +20,17 @@ class Config:
     # Game settings
     MAX_GAMES_PER_IP = int(os.environ.get('MAX_GAMES_PER_IP', '10'))
     GAME_TIMEOUT_MINUTES = int(os.environ.get('GAME_TIMEOUT_MINUTES', '30'))
+    COMPLETED_GAME_TIMEOUT_MINUTES = int(os.environ.get('COMPLETED_GAME_TIMEOUT_MINUTES', '5'))
+    SESSION_SWEEP_INTERVAL_SECONDS = int(os.environ.get('SESSION_SWEEP_INTERVAL_SECONDS', '60'))
+    MOVE_HISTORY_LIMIT = int(os.environ.get('MOVE_HISTORY_LIMIT', '200'))  # moves kept per game
+    
+    # Session storage (sessions are shared between workers only when REDIS_URL is set)
+    REDIS_URL = os.environ.get('REDIS_URL')
+    SESSION_CACHE_SIZE = int(os.environ.get('SESSION_CACHE_SIZE', '256'))
     
     # AI settings
-    AI_MOVE_TIMEOUT = float(os.environ.get('AI_MOVE_TIMEOUT', '10.0'))
+    AI_MOVE_TIMEOUT = float(os.environ.get('AI_MOVE_TIMEOUT', '5.0'))
+    AI_WORKER_THREADS = int(os.environ.get('AI_WORKER_THREADS', '2'))
     
     # Render deployment
     PORT = int(os.environ.get('PORT', '5000'))
\ No newline at end of file
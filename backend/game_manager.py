@@ -4,10 +4,68 @@ Game Manager - Handles game state and move execution
 
 import sys
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), 'tournament_system'))
+import base64
+from functools import lru_cache
+tournament_dir = os.path.join(os.path.dirname(__file__), 'tournament_system')
+if tournament_dir not in sys.path:
+    sys.path.append(tournament_dir)
 
 from mastergoalGame import MastergoalGame
 from position import Position
+from move_codec import encode_move
+
+# Winner for each MastergoalGame.is_game_over() result that ends the game
+GAME_OVER_WINNERS = {1: 'LEFT', -1: 'RIGHT', 0.1: 'DRAW'}
+
+
+def _status_from_game_over(game):
+    """Game status from the game's internal end-of-game logic"""
+    winner = GAME_OVER_WINNERS.get(game.is_game_over())
+    return {'ended': winner is not None, 'winner': winner}
+
+
+@lru_cache(maxsize=64)
+def make_status_checker(win_goals: int | None = None,
+                        max_turns_enabled: bool = False, max_turns: int | None = None):
+    """
+    Build a game status checker specialized for one set of overrides
+    
+    The overrides are fixed for a whole game, so the returned function only
+    contains the checks that are enabled instead of re-testing the config on
+    every turn. Checkers are cached per config; max_turns comes from the
+    client, so the cache is bounded.
+    
+    Returns:
+        Callable taking a game and returning {'ended': bool, 'winner': str | None}
+    """
+    turn_limit = max_turns if max_turns_enabled and max_turns is not None else None
+    
+    if win_goals is None and turn_limit is None:
+        return _status_from_game_over
+    
+    if turn_limit is None:
+        def check_status(game):
+            if game.LEFT_goals >= win_goals:
+                return {'ended': True, 'winner': 'LEFT'}
+            if game.RIGHT_goals >= win_goals:
+                return {'ended': True, 'winner': 'RIGHT'}
+            return _status_from_game_over(game)
+    elif win_goals is None:
+        def check_status(game):
+            if game.turn_count >= turn_limit:
+                return {'ended': True, 'winner': 'DRAW'}
+            return _status_from_game_over(game)
+    else:
+        def check_status(game):
+            if game.LEFT_goals >= win_goals:
+                return {'ended': True, 'winner': 'LEFT'}
+            if game.RIGHT_goals >= win_goals:
+                return {'ended': True, 'winner': 'RIGHT'}
+            if game.turn_count >= turn_limit:
+                return {'ended': True, 'winner': 'DRAW'}
+            return _status_from_game_over(game)
+    
+    return check_status
 
 
 class GameManager:
@@ -17,35 +75,73 @@ class GameManager:
         """Create a new game instance"""
         return MastergoalGame(level)
     
-    def get_game_state(self, game):
-        """Get current game state in JSON-serializable format"""
+    def _get_cached_legal_moves(self, game):
+        """
+        Get the legal moves of a game, generating them at most once per position
+        
+        The cache lives on the game and is keyed by the position (Zobrist hash
+        plus the counters that affect move generation), so moves applied
+        anywhere, including by AI agents, invalidate it automatically.
+        
+        Returns:
+            (moves, move_codes): list of (type, from, to) tuples and a frozenset
+            of the same moves packed as ints (see move_codec.encode_move)
+        """
+        key = (game.zobrist, game.passes_count, game.skip_next_turn)
+        cache = getattr(game, '_legal_moves_cache', None)
+        if cache is None or cache[0] != key:
+            moves = game.get_legal_moves()
+            cache = (key, moves, frozenset(encode_move(*move) for move in moves))
+            game._legal_moves_cache = cache
+        return cache[1], cache[2]
+    
+    def get_game_state(self, game, layout='nested'):
+        """
+        Get current game state in JSON-serializable format
+        
+        Args:
+            game: Game instance
+            layout: 'nested' for one dict per player/move, or 'soa' for
+                parallel arrays (smaller payload, no per-item dicts)
+        """
         # Get basic game state
         state = game.get_game_state()
+        raw_moves, _ = self._get_cached_legal_moves(game)
         
         # Convert to frontend-friendly format
-        players = []
-        for team, player_id, row, col, is_goalkeeper in state['players']:
-            players.append({
-                'team': team,
-                'id': player_id,
-                'position': {'row': row, 'col': col},
-                'isGoalkeeper': is_goalkeeper
-            })
-        
-        # Get legal moves for current player
-        legal_moves = []
-        raw_moves = game.get_legal_moves()
-        
-        for move in raw_moves:
-            move_type, from_pos, to_pos = move
-            legal_moves.append({
-                'type': move_type,
-                'from': {'row': from_pos.row, 'col': from_pos.col},
-                'to': {'row': to_pos.row, 'col': to_pos.col}
-            })
+        if layout == 'soa':
+            teams, ids, rows, cols, goalkeepers = (list(column) for column in zip(*state['players']))
+            players = {
+                'teams': teams,
+                'ids': ids,
+                'rows': rows,
+                'cols': cols,
+                'goalkeepers': goalkeepers
+            }
+            legal_moves = {
+                'types': [move_type for move_type, _, _ in raw_moves],
+                'fromRows': [from_pos.row for _, from_pos, _ in raw_moves],
+                'fromCols': [from_pos.col for _, from_pos, _ in raw_moves],
+                'toRows': [to_pos.row for _, _, to_pos in raw_moves],
+                'toCols': [to_pos.col for _, _, to_pos in raw_moves]
+            }
+        else:
+            players = [
+                {
+                    'team': team,
+                    'id': player_id,
+                    'position': {'row': row, 'col': col},
+                    'isGoalkeeper': is_goalkeeper
+                }
+                for team, player_id, row, col, is_goalkeeper in state['players']
+            ]
+            
+            # Get legal moves for current player
+            legal_moves = self._format_legal_moves(raw_moves)
         
         return {
             'level': state['level'],
+            'layout': layout,
             'currentTeam': state['current_team'],
             'score': {
                 'LEFT': state['LEFT_goals'],
@@ -76,18 +172,20 @@ class GameManager:
             from_pos = Position(from_pos_dict['row'], from_pos_dict['col'])
             to_pos = Position(to_pos_dict['row'], to_pos_dict['col'])
             
-            # Check if move is legal
-            legal_moves = game.get_legal_moves()
-            move = (move_type, from_pos, to_pos)
-            
-            if move not in legal_moves:
+            # Check if move is legal (int hash lookup instead of a list scan)
+            _, legal_codes = self._get_cached_legal_moves(game)
+            # Off-board coordinates would not fit the packed encoding
+            on_board = all(0 <= pos.row < game.ROWS and 0 <= pos.col < game.COLS for pos in (from_pos, to_pos))
+            if (move_type not in ('move', 'kick') or not on_board
+                    or encode_move(move_type, from_pos, to_pos) not in legal_codes):
                 return False, "Illegal move"
             
-            # Execute the move
+            # Execute the move (already validated above, so skip the engine's
+            # own check, which would generate the legal moves again)
             if move_type == 'move':
-                result = game.execute_move(from_pos, to_pos)
+                result = game.apply_move(from_pos, to_pos)
             else:  # kick
-                result = game.execute_kick(to_pos)
+                result = game.apply_kick(to_pos)
             
             if result:
                 return True, "Move executed successfully"
@@ -104,39 +202,43 @@ class GameManager:
         If overrides are provided, they take precedence over the game's
         internal thresholds.
         """
-        # Apply override goals if provided
-        if win_goals is not None:
-            if game.LEFT_goals >= win_goals:
-                return {'ended': True, 'winner': 'LEFT'}
-            if game.RIGHT_goals >= win_goals:
-                return {'ended': True, 'winner': 'RIGHT'}
-
-        # Apply override max turns if enabled
-        if max_turns_enabled and max_turns is not None and game.turn_count >= max_turns:
-            return {'ended': True, 'winner': 'DRAW'}
-
-        # Fall back to game's internal logic
-        result = game.is_game_over()
-        if result == 1:
-            return {'ended': True, 'winner': 'LEFT'}
-        elif result == -1:
-            return {'ended': True, 'winner': 'RIGHT'}
-        elif result == 0.1:
-            return {'ended': True, 'winner': 'DRAW'}
-        else:
-            return {'ended': False, 'winner': None}
+        return make_status_checker(win_goals, max_turns_enabled, max_turns)(game)
+    
+    # Move type codes used by the packed legal-move format
+    PACKED_MOVE_TYPES = {'move': 0, 'kick': 1}
+    
+    def get_legal_moves_packed(self, game):
+        """
+        Get all legal moves packed as base64 bytes
+        
+        Each move takes 5 bytes: type (0 = move, 1 = kick), from row, from col,
+        to row, to col.
+        
+        Returns:
+            (encoded, count): base64 string and number of moves
+        """
+        types = self.PACKED_MOVE_TYPES
+        raw_moves, _ = self._get_cached_legal_moves(game)
+        # Allocate the whole buffer once and fill it in place
+        packed = bytearray(5 * len(raw_moves))
+        offset = 0
+        for move_type, from_pos, to_pos in raw_moves:
+            packed[offset:offset + 5] = (types[move_type], from_pos.row, from_pos.col, to_pos.row, to_pos.col)
+            offset += 5
+        return base64.b64encode(packed).decode('ascii'), len(raw_moves)
     
     def get_legal_moves(self, game):
         """Get all legal moves in frontend format"""
-        legal_moves = []
-        raw_moves = game.get_legal_moves()
-        
-        for move in raw_moves:
-            move_type, from_pos, to_pos = move
-            legal_moves.append({
+        raw_moves, _ = self._get_cached_legal_moves(game)
+        return self._format_legal_moves(raw_moves)
+    
+    def _format_legal_moves(self, raw_moves):
+        """Convert (type, from, to) move tuples to frontend dicts"""
+        return [
+            {
                 'type': move_type,
                 'from': {'row': from_pos.row, 'col': from_pos.col},
                 'to': {'row': to_pos.row, 'col': to_pos.col}
-            })
-        
-        return legal_moves
+            }
+            for move_type, from_pos, to_pos in raw_moves
+        ]
@@ -0,0 +1,340 @@
+"""
+Session Store - Keeps active game sessions
+Without REDIS_URL sessions live in a bounded in-process LRU; when it is
+configured Redis is the only copy of a session, so any worker can serve any
+game, and each worker only caches the (unpicklable) agents.
+"""
+
+import time
+import pickle
+import threading
+import weakref
+import dataclasses
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+@dataclass(slots=True)
+class GameSession:
+    """State of one game session"""
+    game: Any
+    ai_agent: Optional[Any]
+    ai_color: Optional[str]
+    player_color: str
+    level: int
+    difficulty: str
+    mode: str = 'pve'
+    timer_enabled: bool = False
+    timer_minutes: int = 10
+    max_turns_enabled: bool = False
+    max_turns: Optional[int] = None
+    win_goals: int = 2
+    start_time: str = ''
+    move_history: deque = field(default_factory=deque)
+    status: str = 'active'
+    winner: Optional[str] = None
+    # Background AI computation (see _submit_ai_chain in app.py)
+    ai_pending: bool = False
+    ai_task_id: Optional[str] = None
+    ai_result: Optional[dict] = None
+    last_activity: float = 0.0
+
+
+class _SessionLock:
+    """
+    Reentrant lock for one game: a per-process RLock plus, when Redis is
+    configured, a Redis lock so that workers in other processes wait too
+    """
+
+    def __init__(self, redis_lock=None):
+        self._local = threading.RLock()
+        self._redis_lock = redis_lock
+        # Only changed while holding _local
+        self._depth = 0
+
+    def __enter__(self):
+        self._local.acquire()
+        if self._depth == 0 and self._redis_lock is not None:
+            try:
+                if not self._redis_lock.acquire():
+                    raise TimeoutError("Timed out waiting for the game lock")
+            except BaseException:
+                self._local.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._depth -= 1
+        try:
+            if self._depth == 0 and self._redis_lock is not None:
+                self._redis_lock.release()
+        finally:
+            self._local.release()
+        return False
+
+
+class SessionStore:
+    """Dict-like store for game sessions with LRU eviction and optional Redis backing"""
+
+    KEY_PREFIX = 'mastergoal:game:'
+    LOCK_PREFIX = 'mastergoal:lock:'
+    # Game ids scored by last activity, and a small 'status|level|difficulty'
+    # summary per game, so counts and statistics never load whole sessions
+    INDEX_KEY = 'mastergoal:index'
+    SUMMARY_KEY = 'mastergoal:summary'
+
+    def __init__(self, ai_manager, max_local_sessions=256, redis_url=None, ttl_seconds=1800,
+                 lock_timeout=60):
+        """
+        Args:
+            ai_manager: AIManager used to re-attach agents to sessions loaded from Redis
+            max_local_sessions: Maximum number of sessions (or, with Redis, agents) kept in this process
+            redis_url: Redis connection URL, or None to keep sessions in-process only
+            ttl_seconds: Expiry for sessions stored in Redis
+            lock_timeout: Seconds before a game's Redis lock expires on its own
+                (e.g. if its worker died), and the longest a request waits for it
+        """
+        self.ai_manager = ai_manager
+        self.max_local_sessions = max_local_sessions
+        self.ttl_seconds = ttl_seconds
+        self.lock_timeout = lock_timeout
+
+        self._local = OrderedDict()
+        # Agents are not pickled; keep them per worker so their tables survive
+        self._agents = OrderedDict()
+        self._lock = threading.Lock()
+        # Per-game locks, alive only while some thread holds or waits on them
+        self._session_locks = weakref.WeakValueDictionary()
+
+        self._redis = None
+        if redis_url:
+            if redis is None:
+                print("REDIS_URL is set but the redis package is not installed; using in-process sessions")
+            else:
+                self._redis = redis.Redis.from_url(redis_url)
+
+    def get(self, game_id, default=None):
+        """
+        Get a session by id, from Redis when configured, otherwise from the local LRU
+
+        Another worker may have written the game since this one last served
+        it, so with Redis a fresh copy is always loaded.
+
+        Returns:
+            The GameSession, or default if the game does not exist
+        """
+        if self._redis is None:
+            with self._lock:
+                session = self._local.get(game_id)
+                if session is None:
+                    return default
+                self._local.move_to_end(game_id)
+                return session
+
+        data = self._redis.get(self.KEY_PREFIX + game_id)
+        if data is None:
+            return default
+
+        session = pickle.loads(data)
+        session.ai_agent = self._get_agent(game_id, session)
+        return session
+
+    def lock(self, game_id):
+        """
+        Get the lock guarding a session
+
+        Request handlers load, change and put a session while holding it, and
+        the background AI chain holds it while it applies its moves. With
+        Redis it also excludes the other workers, so a get/put pair can't
+        overwrite a write made in between.
+
+        Returns:
+            A reentrant context manager shared by every thread currently using the game
+        """
+        with self._lock:
+            session_lock = self._session_locks.get(game_id)
+            if session_lock is None:
+                redis_lock = None
+                if self._redis is not None:
+                    redis_lock = self._redis.lock(
+                        self.LOCK_PREFIX + game_id,
+                        timeout=self.lock_timeout,
+                        blocking_timeout=self.lock_timeout
+                    )
+                session_lock = _SessionLock(redis_lock)
+                self._session_locks[game_id] = session_lock
+            return session_lock
+
+    def put(self, game_id, session):
+        """Store a session in Redis if configured, otherwise in the local LRU"""
+        session.last_activity = time.time()
+        if self._redis is None:
+            with self._lock:
+                self._remember_session(game_id, session)
+            return
+
+        # The session itself holds its agent in local mode; only sessions
+        # loaded back from Redis need the per-worker agent cache
+        if session.ai_agent is not None:
+            with self._lock:
+                key = (session.level, session.difficulty, game_id)
+                self._remember(self._agents, key, session.ai_agent)
+
+        payload = dataclasses.replace(session, ai_agent=None)
+        summary = f"{session.status}|{session.level}|{session.difficulty}"
+        pipe = self._redis.pipeline()
+        pipe.set(self.KEY_PREFIX + game_id, pickle.dumps(payload), ex=self.ttl_seconds)
+        pipe.zadd(self.INDEX_KEY, {game_id: session.last_activity})
+        pipe.hset(self.SUMMARY_KEY, game_id, summary)
+        pipe.execute()
+
+    def delete(self, game_id):
+        """Remove a session everywhere"""
+        with self._lock:
+            self._local.pop(game_id, None)
+            for key in [k for k in self._agents if k[2] == game_id]:
+                del self._agents[key]
+
+        if self._redis is not None:
+            pipe = self._redis.pipeline()
+            pipe.delete(self.KEY_PREFIX + game_id)
+            pipe.zrem(self.INDEX_KEY, game_id)
+            pipe.hdel(self.SUMMARY_KEY, game_id)
+            pipe.execute()
+
+    def evict_idle(self, idle_seconds, completed_seconds):
+        """
+        Drop in-process sessions that have been idle too long
+
+        With Redis there are no local sessions: Redis entries expire on their
+        own TTL and the agent cache is bounded by its LRU.
+
+        Args:
+            idle_seconds: Evict any session not updated for this long
+            completed_seconds: Evict completed games not updated for this long
+
+        Returns:
+            Number of sessions evicted
+        """
+        now = time.time()
+        expired = []
+        with self._lock:
+            for game_id, session in self._local.items():
+                if session.ai_pending:
+                    continue
+                idle = now - session.last_activity
+                if idle > idle_seconds or (session.status == 'completed' and idle > completed_seconds):
+                    expired.append(game_id)
+
+        with self._lock:
+            for game_id in expired:
+                self._local.pop(game_id, None)
+                for key in [k for k in self._agents if k[2] == game_id]:
+                    del self._agents[key]
+        return len(expired)
+
+    def summaries(self):
+        """
+        Get a (status, level, difficulty) summary of every stored session
+
+        With Redis this reads the summary hash instead of loading sessions.
+
+        Returns:
+            List of (status, level, difficulty) tuples
+        """
+        if self._redis is None:
+            with self._lock:
+                return [(s.status, s.level, s.difficulty) for s in self._local.values()]
+
+        self._prune_index()
+        summaries = []
+        for value in self._redis.hvals(self.SUMMARY_KEY):
+            status, level, difficulty = value.decode().split('|')
+            summaries.append((status, int(level), difficulty))
+        return summaries
+
+    def _prune_index(self):
+        """Drop index and summary entries of Redis sessions that have expired"""
+        cutoff = time.time() - self.ttl_seconds
+        expired = self._redis.zrangebyscore(self.INDEX_KEY, '-inf', cutoff)
+        if expired:
+            pipe = self._redis.pipeline()
+            pipe.zrem(self.INDEX_KEY, *expired)
+            pipe.hdel(self.SUMMARY_KEY, *expired)
+            pipe.execute()
+
+    def _get_agent(self, game_id, session):
+        """Re-attach the agent for a session loaded from Redis"""
+        if session.mode != 'pve':
+            return None
+
+        key = (session.level, session.difficulty, game_id)
+        with self._lock:
+            agent = self._agents.get(key)
+            if agent is not None:
+                self._agents.move_to_end(key)
+                return agent
+
+        return self.ai_manager.get_agent(session.level, session.difficulty)
+
+    def _remember(self, cache, key, value):
+        """Insert into an LRU OrderedDict, evicting the oldest entry when full"""
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_local_sessions:
+            cache.popitem(last=False)
+
+    def _remember_session(self, game_id, session):
+        """
+        Insert into the local session LRU (the caller holds self._lock)
+
+        When full, the least recently used completed or idle sessions are
+        evicted; games still being played (or waiting on the AI) are never
+        dropped, so the limit can be exceeded until the sweeper catches up.
+        """
+        self._local[game_id] = session
+        self._local.move_to_end(game_id)
+        excess = len(self._local) - self.max_local_sessions
+        if excess <= 0:
+            return
+
+        now = time.time()
+        evictable = []
+        for old_id, old in self._local.items():
+            if len(evictable) == excess:
+                break
+            if old_id == game_id or old.ai_pending:
+                continue
+            if old.status == 'completed' or now - old.last_activity > self.ttl_seconds:
+                evictable.append(old_id)
+        for old_id in evictable:
+            del self._local[old_id]
+
+    def __contains__(self, game_id):
+        return self.get(game_id) is not None
+
+    def __getitem__(self, game_id):
+        session = self.get(game_id)
+        if session is None:
+            raise KeyError(game_id)
+        return session
+
+    def __setitem__(self, game_id, session):
+        self.put(game_id, session)
+
+    def __delitem__(self, game_id):
+        self.delete(game_id)
+
+    def __len__(self):
+        if self._redis is None:
+            with self._lock:
+                return len(self._local)
+        self._prune_index()
+        return self._redis.zcard(self.INDEX_KEY)
@@ -4,6 +4,7 @@ Wraps the trained AlphaZero model with MCTS for tournament play.
 """
 
 import time
+from collections import OrderedDict
 import numpy as np
 import torch
 from typing import Any, Tuple
@@ -31,7 +32,11 @@ class AlphaZeroAgent(BaseAgent):
                  checkpoint_path: str,
                  num_mcts_sims: int = 400,
                  cpuct: float = 2.0,
-                 temp: float = 0.0):
+                 temp: float = 0.0,
+                 quantize: str = None,
+                 eval_cache_size: int = 100000,
+                 reuse_tree: bool = False,
+                 max_tree_states: int = 200000):
         """
         Initialize AlphaZero agent.
         
@@ -42,6 +47,17 @@ class AlphaZeroAgent(BaseAgent):
             num_mcts_sims: Number of MCTS simulations per move
             cpuct: Exploration constant for MCTS
             temp: Temperature for action selection (0 = deterministic)
+            quantize: Optional inference quantization; 'int8' applies dynamic
+                int8 quantization to the Linear layers (CPU inference only).
+                Check policy agreement with the FP32 model before enabling.
+            eval_cache_size: Max positions whose network output is memoized
+                (kept across games; 0 disables the cache)
+            reuse_tree: Keep the MCTS tree (visit counts, Q values, priors)
+                across games instead of starting each game from an empty tree.
+                Off by default: with temp=0 the chosen moves then also depend
+                on visits gathered in earlier games
+            max_tree_states: With reuse_tree, start a new tree at the next
+                reset once the kept one holds more states than this
         """
         super().__init__(name, level, GameLogic.ALPHAZERO)
         
@@ -49,6 +65,18 @@ class AlphaZeroAgent(BaseAgent):
         self.num_mcts_sims = num_mcts_sims
         self.cpuct = cpuct
         self.temp = temp
+        self.quantize = quantize
+        self.reuse_tree = reuse_tree
+        self.max_tree_states = max_tree_states
+        
+        # Network output per position (policy, value), shared by every MCTS tree
+        # this agent builds; transpositions and repeated positions skip the NN
+        self.eval_cache = OrderedDict()
+        self.eval_cache_size = eval_cache_size
+        self.eval_cache_hits = 0
+        
+        if quantize not in (None, 'int8'):
+            raise ValueError(f"Unsupported quantize option: {quantize}")
         
         # Import AlphaZero components
         try:
@@ -70,6 +98,17 @@ class AlphaZeroAgent(BaseAgent):
             
             self.nnet.load_checkpoint(checkpoint_dir, checkpoint_file)
             
+            if quantize == 'int8':
+                self._quantize_int8()
+            
+            # Inference only: no autograd bookkeeping on the per-leaf forward passes,
+            # and let cuDNN pick the fastest kernels for the fixed board shape
+            if torch.cuda.is_available():
+                torch.backends.cudnn.benchmark = True
+            self.nnet.predict = self._inference_mode(self.nnet.predict)
+            if eval_cache_size > 0:
+                self.nnet.predict = self._cached_predict(self.nnet.predict)
+            
             # Set up MCTS args
             from utils import dotdict
             self.mcts_args = dotdict({
@@ -87,6 +126,42 @@ class AlphaZeroAgent(BaseAgent):
         except Exception as e:
             raise RuntimeError(f"Failed to initialize AlphaZero agent: {e}")
     
+    def _quantize_int8(self):
+        """Replace the network's Linear layers with dynamically quantized int8 ones."""
+        model = self.nnet.nnet
+        if any(p.is_cuda for p in model.parameters()):
+            raise ValueError("int8 quantization is only supported for CPU inference")
+        # Conv layers have no dynamic int8 kernel; only Linear layers are converted
+        self.nnet.nnet = torch.ao.quantization.quantize_dynamic(
+            model.eval(), {torch.nn.Linear}, dtype=torch.qint8
+        )
+    
+    @staticmethod
+    def _inference_mode(predict):
+        """Wrap a predict function so it always runs under torch.inference_mode()."""
+        def predict_inference(board):
+            with torch.inference_mode():
+                return predict(board)
+        return predict_inference
+    
+    def _cached_predict(self, predict):
+        """Wrap a predict function with the position-keyed evaluation cache."""
+        def predict_cached(board):
+            key = self.game.stringRepresentation(board)
+            cached = self.eval_cache.get(key)
+            if cached is not None:
+                self.eval_cache.move_to_end(key)
+                self.eval_cache_hits += 1
+            else:
+                cached = predict(board)
+                self.eval_cache[key] = cached
+                if len(self.eval_cache) > self.eval_cache_size:
+                    self.eval_cache.popitem(last=False)
+            pi, v = cached
+            # MCTS normalises the policy in place, so hand out a copy
+            return pi.copy(), v
+        return predict_cached
+    
     def get_move(self, game_state: Any, time_limit: float = 60.0) -> Tuple[int, float]:
         """
         Get move using AlphaZero MCTS.
@@ -137,9 +212,14 @@ class AlphaZeroAgent(BaseAgent):
                 raise RuntimeError(f"No valid moves available for {self.name}")
     
     def reset(self):
-        """Reset MCTS tree between games."""
-        # Recreate MCTS instance to clear tree
-        self.mcts = MCTS(self.game, self.nnet, self.mcts_args)
+        """Reset between games (the evaluation cache is kept)."""
+        # The tree is keyed by board state, so with reuse_tree the statistics
+        # gathered for recurring positions (e.g. openings) carry over, and
+        # within a game each search already starts from the stored subtree;
+        # the cap keeps its per-state dicts from growing for a whole tournament
+        if not self.reuse_tree or len(self.mcts.Ns) > self.max_tree_states:
+            # Recreate MCTS instance to clear tree
+            self.mcts = MCTS(self.game, self.nnet, self.mcts_args)
         self.games_played += 1
     
     def get_stats(self) -> dict:
@@ -150,6 +230,11 @@ class AlphaZeroAgent(BaseAgent):
             'num_mcts_sims': self.num_mcts_sims,
             'cpuct': self.cpuct,
             'temperature': self.temp,
+            'quantize': self.quantize,
+            'reuse_tree': self.reuse_tree,
+            'max_tree_states': self.max_tree_states,
+            'eval_cache_entries': len(self.eval_cache),
+            'eval_cache_hits': self.eval_cache_hits,
             'checkpoint': self.checkpoint_path
         })
         return stats
\ No newline at end of file
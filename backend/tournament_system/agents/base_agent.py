@@ -3,8 +3,11 @@ Base Agent Interface for Tournament System
 Provides a unified interface for all agent types regardless of underlying game logic.
 """
 
+import copy
+import time
+import random
 from abc import ABC, abstractmethod
-from typing import Any, Tuple, Optional
+from typing import Any, Callable, List, Tuple, Optional
 from enum import Enum
 
 
@@ -51,6 +54,83 @@ class BaseAgent(ABC):
         """
         pass
     
+    def get_move_chain(self,
+                       game: Any,
+                       team: str,
+                       time_limit: float = 60.0,
+                       max_moves: int = 10,
+                       stop_condition: Optional[Callable[[Any], bool]] = None) -> List[Any]:
+        """
+        Play consecutive moves for `team` until the turn passes.
+        
+        Moves are applied directly to `game` (standard logic), so passes and
+        extra turns are searched again without leaving the agent, and the
+        whole chain shares one time budget. Once the budget is spent, any move
+        still owed (e.g. a forced kick) is chosen at random instead of searched.
+        
+        Args:
+            game: Mutable game instance; modified in place
+            team: Team the agent plays as
+            time_limit: Total time budget for the whole chain in seconds
+            max_moves: Safety cap on the number of chained moves
+            stop_condition: Optional callable(game) -> bool checked after each
+                move (e.g. custom win/turn limits); the chain stops when True
+            
+        Returns:
+            List of applied (move_type, from_pos, to_pos) tuples
+        """
+        moves = []
+        start_time = time.time()
+        
+        while game.current_team == team and len(moves) < max_moves:
+            remaining = time_limit - (time.time() - start_time)
+            move = None
+            try:
+                if remaining > 0:
+                    move, _ = self.get_move(game, time_limit=remaining)
+                else:
+                    print(f"{self.name} is out of time, playing a random move")
+            except Exception as e:
+                print(f"Error in {self.name}.get_move_chain: {e}")
+            
+            if not move:
+                legal_moves = game.get_legal_moves()
+                move = random.choice(legal_moves) if legal_moves else None
+            
+            if not move:
+                break
+            
+            move_type, from_pos, to_pos = move
+            if move_type == 'move':
+                success = game.execute_move(from_pos, to_pos)
+            else:
+                success = game.execute_kick(to_pos)
+            if not success:
+                break
+            
+            moves.append(move)
+            if stop_condition is not None and stop_condition(game):
+                break
+        
+        return moves
+    
+    def spawn(self) -> 'BaseAgent':
+        """
+        Create a per-session agent from this (shared, pre-built) agent.
+        
+        Heavy read-only state such as weights, evaluators and static tables is
+        shared by reference. Subclasses that keep per-game search state must
+        override this and give the copy its own.
+        
+        Returns:
+            A new agent ready to play one game
+        """
+        agent = copy.copy(self)
+        agent.team = None
+        agent.games_played = 0
+        agent.total_thinking_time = 0.0
+        return agent
+    
     @abstractmethod
     def reset(self):
         """
@@ -8,6 +8,7 @@ import time
 import random
 from typing import Any, Tuple, List
 from agents.base_agent import BaseAgent, GameLogic
+from position import Position
 
 
 class HeuristicAgent(BaseAgent):
@@ -33,6 +34,8 @@ class HeuristicAgent(BaseAgent):
         """
         super().__init__(name, level, GameLogic.STANDARD)
         self.team = None
+        # Opponent goal squares as (row, col), built once per team
+        self.goal_squares = {}
         self.initialized = True
     
     def set_team(self, team: str):
@@ -88,9 +91,19 @@ class HeuristicAgent(BaseAgent):
         5. Defensive positioning
         6. Random from remaining
         """
-        # Separate moves into kicks and player movements
-        kick_moves = [m for m in moves if m[0] == 'kick']
-        player_moves = [m for m in moves if m[0] == 'move']
+        # Bind everything the rules read once, as plain locals
+        ball_row = game.ball.position.row
+        ball_col = game.ball.position.col
+        is_left = self.team == game.LEFT
+        
+        # Separate moves into kicks and player movements (one pass)
+        kick_moves = []
+        player_moves = []
+        for m in moves:
+            if m[0] == 'kick':
+                kick_moves.append(m)
+            elif m[0] == 'move':
+                player_moves.append(m)
         
         # Rule 1: Try to score a goal
         goal_moves = self._find_goal_moves(game, kick_moves)
@@ -99,25 +112,25 @@ class HeuristicAgent(BaseAgent):
         
         # Rule 2: Advance ball towards opponent's goal
         if kick_moves:
-            advancing_kicks = self._find_advancing_kicks(game, kick_moves)
+            advancing_kicks = self._find_advancing_kicks(kick_moves, ball_row, is_left)
             if advancing_kicks:
                 return random.choice(advancing_kicks)
         
         # Rule 3: Pass to better-positioned teammate (level 2+)
         if self.level >= 2 and kick_moves:
-            pass_moves = self._find_good_passes(game, kick_moves)
+            pass_moves = self._find_good_passes(game, kick_moves, is_left)
             if pass_moves:
                 return random.choice(pass_moves)
         
         # Rule 4: Move player closer to ball
         if player_moves:
-            approaching_moves = self._find_ball_approaching_moves(game, player_moves)
+            approaching_moves = self._find_ball_approaching_moves(player_moves, ball_row, ball_col)
             if approaching_moves:
                 return random.choice(approaching_moves)
         
         # Rule 5: Defensive positioning
         if player_moves:
-            defensive_moves = self._find_defensive_moves(game, player_moves)
+            defensive_moves = self._find_defensive_moves(player_moves, ball_row, is_left)
             if defensive_moves:
                 return random.choice(defensive_moves)
         
@@ -126,101 +139,74 @@ class HeuristicAgent(BaseAgent):
     
     def _find_goal_moves(self, game, kick_moves: List) -> List:
         """Find kicks that score a goal."""
-        goal_moves = []
-        
-        for move in kick_moves:
-            _, _, to_pos = move
-            
-            # Check if this position is a goal for our team
-            if self.team == game.LEFT and game.is_goal_RIGHT(to_pos):
-                goal_moves.append(move)
-            elif self.team == game.RIGHT and game.is_goal_LEFT(to_pos):
-                goal_moves.append(move)
-        
-        return goal_moves
-    
-    def _find_advancing_kicks(self, game, kick_moves: List) -> List:
-        """Find kicks that advance ball towards opponent's goal."""
-        current_ball_row = game.ball.position.row
-        advancing_kicks = []
-        
-        for move in kick_moves:
-            _, _, to_pos = move
-            
-            # Calculate advancement
+        goal_squares = self.goal_squares.get(self.team)
+        if goal_squares is None:
+            # Check if the target position is a goal for our team
             if self.team == game.LEFT:
-                # LEFT advances towards row 14 (opponent's goal)
-                if to_pos.row > current_ball_row:
-                    advancing_kicks.append(move)
+                is_goal = game.is_goal_RIGHT
+            elif self.team == game.RIGHT:
+                is_goal = game.is_goal_LEFT
             else:
-                # RIGHT advances towards row 0 (opponent's goal)
-                if to_pos.row < current_ball_row:
-                    advancing_kicks.append(move)
-        
-        return advancing_kicks
+                return []
+            goal_squares = frozenset(
+                (row, col)
+                for row in range(game.ROWS)
+                for col in range(game.COLS)
+                if is_goal(Position(row, col))
+            )
+            self.goal_squares[self.team] = goal_squares
+        
+        return [move for move in kick_moves if (move[2].row, move[2].col) in goal_squares]
+    
+    def _find_advancing_kicks(self, kick_moves: List, ball_row: int, is_left: bool) -> List:
+        """Find kicks that advance ball towards opponent's goal."""
+        if is_left:
+            # LEFT advances towards row 14 (opponent's goal)
+            return [move for move in kick_moves if move[2].row > ball_row]
+        # RIGHT advances towards row 0 (opponent's goal)
+        return [move for move in kick_moves if move[2].row < ball_row]
     
-    def _find_good_passes(self, game, kick_moves: List) -> List:
+    def _find_good_passes(self, game, kick_moves: List, is_left: bool) -> List:
         """Find passes to well-positioned teammates."""
-        good_passes = []
-        
-        teammates = game.get_team_players(self.team)
-        opponent_goal_row = 14 if self.team == game.LEFT else 0
-        
-        for move in kick_moves:
-            _, _, to_pos = move
-            
-            # Check if any teammate is adjacent to target position
-            for teammate in teammates:
-                if teammate.position.is_adjacent(to_pos):
-                    # Prefer passes to teammates closer to opponent goal
-                    teammate_distance_to_goal = abs(teammate.position.row - opponent_goal_row)
-                    
-                    if teammate_distance_to_goal < 7:  # Closer than midfield
-                        good_passes.append(move)
-                        break
-        
-        return good_passes
+        opponent_goal_row = 14 if is_left else 0
+        
+        # Prefer passes to teammates closer to opponent goal than midfield;
+        # a pass is good if its target is adjacent to one of them, so collect
+        # the squares around those teammates once
+        good_squares = {
+            (teammate.position.row + dr, teammate.position.col + dc)
+            for teammate in game.get_team_players(self.team)
+            if abs(teammate.position.row - opponent_goal_row) < 7
+            for dr in (-1, 0, 1)
+            for dc in (-1, 0, 1)
+            if dr or dc
+        }
+        if not good_squares:
+            return []
+        
+        return [move for move in kick_moves if (move[2].row, move[2].col) in good_squares]
     
-    def _find_ball_approaching_moves(self, game, player_moves: List) -> List:
+    def _find_ball_approaching_moves(self, player_moves: List, ball_row: int, ball_col: int) -> List:
         """Find player moves that get closer to the ball."""
-        ball_pos = game.ball.position
-        approaching_moves = []
-        
-        for move in player_moves:
-            _, from_pos, to_pos = move
-            
-            current_distance = from_pos.distance(ball_pos)
-            new_distance = to_pos.distance(ball_pos)
-            
-            # Move gets us closer to ball
-            if new_distance < current_distance:
-                approaching_moves.append(move)
-        
-        return approaching_moves
+        # Chebyshev distance (Position.distance) inlined on plain ints
+        return [
+            move for move in player_moves
+            if max(abs(move[2].row - ball_row), abs(move[2].col - ball_col))
+            < max(abs(move[1].row - ball_row), abs(move[1].col - ball_col))
+        ]
     
-    def _find_defensive_moves(self, game, player_moves: List) -> List:
+    def _find_defensive_moves(self, player_moves: List, ball_row: int, is_left: bool) -> List:
         """Find moves that improve defensive positioning."""
-        defensive_moves = []
-        
-        # Get our goal position
-        our_goal_row = 0 if self.team == game.LEFT else 14
-        ball_row = game.ball.position.row
-        
-        for move in player_moves:
-            _, from_pos, to_pos = move
-            
-            # If ball is in our half, move towards it defensively
-            if self.team == game.LEFT:
-                if ball_row < 7:  # Ball in our half
-                    # Move closer to ball while staying between ball and goal
-                    if to_pos.row < ball_row and to_pos.row > our_goal_row:
-                        defensive_moves.append(move)
-            else:
-                if ball_row > 7:  # Ball in our half
-                    if to_pos.row > ball_row and to_pos.row < our_goal_row:
-                        defensive_moves.append(move)
-        
-        return defensive_moves
+        # If ball is in our half, move towards it defensively
+        if is_left:
+            if ball_row < 7:  # Ball in our half (goal at row 0)
+                # Move closer to ball while staying between ball and goal
+                return [move for move in player_moves if 0 < move[2].row < ball_row]
+        else:
+            if ball_row > 7:  # Ball in our half (goal at row 14)
+                return [move for move in player_moves if ball_row < move[2].row < 14]
+        
+        return []
     
     def reset(self):
         """Reset between games."""
@@ -5,10 +5,28 @@ Enhanced version with improved decision-making and tactical awareness
 
 import time
 import random
+from math import inf
+from collections import Counter
 from typing import Any, Tuple, List, Optional
 from agents.base_agent import BaseAgent, GameLogic
 
 
+def _quadrant_at(row: int, col: int) -> int:
+    """Get quadrant number for a (row, col) square."""
+    if 7 <= row <= 13:
+        if 0 <= col <= 5:
+            return 1
+        elif 6 <= col <= 10:
+            return 2
+    elif 1 <= row <= 6:
+        if 0 <= col <= 5:
+            return 3
+        elif 6 <= col <= 10:
+            return 4
+    
+    return 0
+
+
 class HeuristicAgentLevel2(BaseAgent):
     """
     Advanced heuristic AI that uses multi-layered strategic analysis for Level 2.
@@ -21,7 +39,12 @@ class HeuristicAgentLevel2(BaseAgent):
     - Defensive awareness and counter-positioning
     """
     
-    def __init__(self, name: str, level: int, advanced: bool = True):
+    # Quadrant of every square of the 15x11 field, QUADRANT_TABLE[row][col]
+    QUADRANT_TABLE = tuple(tuple(_quadrant_at(row, col) for col in range(11)) for row in range(15))
+    # Columns of the goal mouth
+    GOAL_COLS = frozenset({3, 4, 5, 6, 7})
+    
+    def __init__(self, name: str, level: int, advanced: bool = True, seed: Optional[int] = None):
         """
         Initialize Level 2 Heuristic Agent.
         
@@ -29,12 +52,17 @@ class HeuristicAgentLevel2(BaseAgent):
             name: Agent name for tournament identification
             level: Game level (should be 2)
             advanced: If True, uses full strategic analysis. If False, uses simpler approach
+            seed: Seed for the agent's own random generator (None = unseeded),
+                so its random choices can be replayed
         """
         # Initialize base agent with standard logic
         super().__init__(name, level, GameLogic.STANDARD)
         
         self.advanced = advanced
         self.team = None
+        self._rng = random.Random(seed)
+        # Per-turn snapshot of the board, built by _build_turn_context
+        self._ctx = None
         
         # Field dimensions (assuming 15x11 grid)
         self.field_rows = 15
@@ -87,7 +115,7 @@ class HeuristicAgentLevel2(BaseAgent):
             
             # Fallback: random move
             if legal_moves:
-                return random.choice(legal_moves), thinking_time
+                return self._rng.choice(legal_moves), thinking_time
             else:
                 raise RuntimeError(f"No valid moves for {self.name}")
     
@@ -101,25 +129,48 @@ class HeuristicAgentLevel2(BaseAgent):
         """
         Apply advanced heuristic rules to select best move.
         """
-        # Separate moves into kicks and player movements
-        kick_moves = [m for m in moves if m[0] == 'kick']
-        player_moves = [m for m in moves if m[0] == 'move']
-        
-        # Priority 1: Immediate goal opportunity
-        goal_moves = self._find_goal_moves(game, kick_moves)
-        if goal_moves:
-            return random.choice(goal_moves)
+        # The rosters do not change while a move is chosen: snapshot them once
+        self._ctx = self._build_turn_context(game)
+        try:
+            return self._apply_heuristic_rules(game, moves)
+        finally:
+            # The context only describes this turn; helpers must not read it later
+            self._ctx = None
+    
+    def _apply_heuristic_rules(self, game, moves: List) -> Any:
+        """
+        Select the move by priority, using the turn context in self._ctx.
+        """
+        # Separate moves into kicks and player movements (one pass).
+        # Priority 1: Immediate goal opportunity. Every goal kick scores the
+        # same point and resets the board the same way, so the first one found
+        # is played without looking at the remaining moves
+        is_goal = game.is_goal_RIGHT if self._ctx['is_left'] else game.is_goal_LEFT
+        kick_moves = []
+        player_moves = []
+        for m in moves:
+            if m[0] == 'kick':
+                if is_goal(m[2]):
+                    return m
+                kick_moves.append(m)
+            elif m[0] == 'move':
+                player_moves.append(m)
         
         # Priority 2: Use advanced evaluation if enabled
         if self.advanced:
             # Evaluate all kicks with scoring system
             if kick_moves:
-                best_kick = self._evaluate_kicks_advanced(game, kick_moves)
-                kick_score = self._score_kick(game, best_kick) if best_kick else 0
+                # Both passes share the turn context (rosters, nearby-player
+                # tables), and the winners keep their scores instead of being
+                # scored again for the comparison
+                best_kick, kick_score = self._best_scored(
+                    kick_moves, self._score_kicks(game, kick_moves, prune=True))
                 
                 # Evaluate best player move
-                best_player_move = self._evaluate_moves_advanced(game, player_moves) if player_moves else None
-                move_score = self._score_player_move(game, best_player_move) if best_player_move else 0
+                best_player_move, move_score = None, 0
+                if player_moves:
+                    best_player_move, move_score = self._best_scored(
+                        player_moves, self._score_player_moves(game, player_moves))
                 
                 # Choose between kick and move based on scores
                 if kick_score > move_score and best_kick:
@@ -131,9 +182,9 @@ class HeuristicAgentLevel2(BaseAgent):
         
         # Priority 3: Simple advancing kick
         if kick_moves:
-            advancing_kicks = self._find_advancing_kicks(game, kick_moves)
-            if advancing_kicks:
-                return self._select_best_advancing_kick(game, advancing_kicks)
+            advancing_kick = self._select_best_advancing_kick(game, kick_moves)
+            if advancing_kick:
+                return advancing_kick
         
         # Priority 4: Move player strategically towards ball
         if player_moves:
@@ -142,313 +193,357 @@ class HeuristicAgentLevel2(BaseAgent):
                 return strategic_move
         
         # Fallback: random move
-        return random.choice(moves)
+        return self._rng.choice(moves)
+    
+    def _build_turn_context(self, game) -> dict:
+        """
+        Snapshot everything the helpers derive from the game for this turn:
+        side, goal row, ball square and quadrant, and both rosters as plain
+        (row, col) tuples.
+        """
+        team = game.current_team
+        is_left = team == game.LEFT
+        opponent_team = game.RIGHT if is_left else game.LEFT
+        ball_row, ball_col = game.ball.position.row, game.ball.position.col
+        attack_quads = [3, 4] if is_left else [1, 2]
+        opp_positions = [(p.position.row, p.position.col) for p in game.get_team_players(opponent_team)]
+        return {
+            'is_left': is_left,
+            'goal_row': 14 if is_left else 0,
+            # Row direction of attack
+            'sign': 1 if is_left else -1,
+            'ball_row': ball_row,
+            'ball_col': ball_col,
+            'ball_quad': self.QUADRANT_TABLE[ball_row][ball_col],
+            # Quadrants on the opponent's half, and the one with fewer opponents
+            'attack_quads': attack_quads,
+            'less_def_quad': self._get_less_defended_quadrant(opp_positions, attack_quads),
+            'team_positions': [(p.position.row, p.position.col) for p in game.get_team_players(team)],
+            'opp_positions': opp_positions,
+            # Coverage tables built by _near_counts, keyed by (roster, distance)
+            'near_counts': {}
+        }
     
     def _evaluate_kicks_advanced(self, game, kick_moves: List) -> Optional[Tuple]:
         """Evaluate all kicks using multi-factor scoring."""
         if not kick_moves:
             return None
         
-        best_kick = None
-        best_score = float('-inf')
+        return self._best_scored(kick_moves, self._score_kicks(game, kick_moves, prune=True))[0]
+    
+    @staticmethod
+    def _best_scored(moves: List, scores: List[float]) -> Tuple[Optional[Tuple], float]:
+        """Return the first highest-scoring move and its score."""
+        best_move = None
+        best_score = -inf
         
-        for kick in kick_moves:
-            score = self._score_kick(game, kick)
+        for move, score in zip(moves, scores):
             if score > best_score:
                 best_score = score
-                best_kick = kick
+                best_move = move
         
-        return best_kick
+        return best_move, best_score
     
-    def _score_kick(self, game, kick_move: Tuple) -> float:
+    def _score_kick(self, game, kick_move: Tuple) -> int:
         """Score a kick based on multiple strategic factors."""
-        _, from_pos, to_pos = kick_move
-        score = 0.0
-        
-        # Factor 1: Distance to goal
-        goal_row = 14 if game.current_team == game.LEFT else 0
-        goal_center_col = 5
-        distance_to_goal = abs(to_pos.row - goal_row) + abs(to_pos.col - goal_center_col)
-        score += self.WEIGHT_GOAL_PROXIMITY * (15 - distance_to_goal)
-        
-        # Factor 2: Advancement towards goal
-        current_ball_row = from_pos.row
-        if game.current_team == game.LEFT:
-            advancement = to_pos.row - current_ball_row
-        else:
-            advancement = current_ball_row - to_pos.row
-        score += self.WEIGHT_ADVANCEMENT * advancement
-        
-        # Factor 3: Passing to teammate
-        teammates_nearby = self._count_teammates_near(game, to_pos, distance=1)
-        score += self.WEIGHT_PASSING_LANE * teammates_nearby * 2
-        
-        # Factor 4: Avoid opponent control
-        opponents_nearby = self._count_opponents_near(game, to_pos, distance=1)
-        score -= self.WEIGHT_BALL_CONTROL * opponents_nearby * 3
-        
-        # Factor 5: Space control - prefer center
-        center_bonus = 2 - abs(to_pos.col - 5) / 5.0
-        score += self.WEIGHT_SPACE_CONTROL * center_bonus
+        return self._score_kicks(game, [kick_move])[0]
+    
+    def _score_kicks(self, game, kick_moves: List, prune: bool = False) -> List[int]:
+        """
+        Score kicks based on multiple strategic factors.
         
-        # Factor 6: Clear shooting lanes
-        if self._has_clear_path_to_goal(game, to_pos):
-            score += self.WEIGHT_GOAL_OPPORTUNITY * 0.3
+        All kicks are scored in one pass: everything that depends only on the
+        turn (goal row, direction, nearby-player tables, weights) is looked up
+        once instead of once per kick. Every factor is a whole number, so the
+        scores are kept as ints.
         
-        # Factor 7: Quadrant positioning
-        quadrant_bonus = self._evaluate_quadrant_value(game, to_pos)
-        score += quadrant_bonus
+        With prune, the scores are only meant for picking the best kick: once
+        the cheap factors show a kick cannot beat the best score so far even
+        with the full clear-path and quadrant bonuses, it scores -inf and
+        those checks are skipped.
+        """
+        ctx = self._ctx
+        goal_row = ctx['goal_row']
+        sign = ctx['sign']
+        goal_center_col = 5
+        teammates_near = self._near_counts('team_positions', 1)
+        opponents_near = self._near_counts('opp_positions', 1)
+        weight_goal_proximity = self.WEIGHT_GOAL_PROXIMITY
+        weight_advancement = self.WEIGHT_ADVANCEMENT
+        weight_passing_lane = self.WEIGHT_PASSING_LANE
+        weight_ball_control = self.WEIGHT_BALL_CONTROL
+        weight_space_control = self.WEIGHT_SPACE_CONTROL
+        clear_path_bonus = self.WEIGHT_GOAL_OPPORTUNITY * 3 // 10
+        # Most factors 6 and 7 can add (see _evaluate_quadrant_value)
+        bonus_bound = clear_path_bonus + 5 + 10 + 8
+        best_score = -inf
+        
+        scores = []
+        for _, from_pos, to_pos in kick_moves:
+            to_row, to_col = to_pos.row, to_pos.col
+            score = 0
+            
+            # Factor 1: Distance to goal
+            distance_to_goal = abs(to_row - goal_row) + abs(to_col - goal_center_col)
+            score += weight_goal_proximity * (15 - distance_to_goal)
+            
+            # Factor 2: Advancement towards goal
+            advancement = (to_row - from_pos.row) * sign
+            score += weight_advancement * advancement
+            
+            # Factor 3: Passing to teammate
+            score += weight_passing_lane * teammates_near[to_row, to_col] * 2
+            
+            # Factor 4: Avoid opponent control
+            score -= weight_ball_control * opponents_near[to_row, to_col] * 3
+            
+            # Factor 5: Space control - prefer center
+            # weight * (2 - |col - 5| / 5), exact while the weight is a multiple of 5
+            score += weight_space_control * (10 - abs(to_col - 5)) // 5
+            
+            if prune:
+                if score + bonus_bound <= best_score:
+                    scores.append(-inf)
+                    continue
+            
+            # Factor 6: Clear shooting lanes
+            if self._has_clear_path_to_goal(game, to_pos):
+                score += clear_path_bonus
+            
+            # Factor 7: Quadrant positioning
+            score += self._evaluate_quadrant_value(game, to_pos)
+            
+            if score > best_score:
+                best_score = score
+            scores.append(score)
         
-        return score
+        return scores
     
     def _evaluate_moves_advanced(self, game, player_moves: List) -> Optional[Tuple]:
         """Evaluate all player moves using multi-factor scoring."""
         if not player_moves:
             return None
         
-        best_move = None
-        best_score = float('-inf')
-        
-        for move in player_moves:
-            score = self._score_player_move(game, move)
-            if score > best_score:
-                best_score = score
-                best_move = move
-        
-        return best_move
+        return self._best_scored(player_moves, self._score_player_moves(game, player_moves))[0]
     
     def _score_player_move(self, game, player_move: Tuple) -> float:
         """Score a player move based on multiple strategic factors."""
-        _, from_pos, to_pos = player_move
-        score = 0.0
-        ball_pos = game.ball.position
-        
-        # Factor 1: Distance to ball
-        current_distance = from_pos.distance(ball_pos)
-        new_distance = to_pos.distance(ball_pos)
-        distance_improvement = current_distance - new_distance
-        score += self.WEIGHT_BALL_CONTROL * distance_improvement * 5
-        
-        # Factor 2: Support positioning
-        teammates_nearby = self._count_teammates_near(game, to_pos, distance=2)
-        score += self.WEIGHT_PASSING_LANE * teammates_nearby
-        
-        # Factor 3: Defensive positioning
-        if self._is_defensive_position_needed(game):
-            defensive_value = self._evaluate_defensive_position(game, to_pos)
-            score += self.WEIGHT_DEFENSIVE * defensive_value
-        
-        # Factor 4: Quadrant positioning
-        quadrant_bonus = self._evaluate_quadrant_value(game, to_pos, for_player=True)
-        score += quadrant_bonus
-        
-        # Factor 5: Adjacent to ball bonus
-        if new_distance <= 1:
-            score += self.WEIGHT_BALL_CONTROL * 5
-        
-        # Factor 6: Forward positioning
-        if game.current_team == game.LEFT and to_pos.row > from_pos.row:
-            score += self.WEIGHT_ADVANCEMENT * 2
-        elif game.current_team == game.RIGHT and to_pos.row < from_pos.row:
-            score += self.WEIGHT_ADVANCEMENT * 2
-        
-        # Factor 7: Avoid clustering
-        if teammates_nearby > 2:
-            score -= 5 * (teammates_nearby - 2)
-        
-        return score
+        return self._score_player_moves(game, [player_move])[0]
     
-    def _count_teammates_near(self, game, pos, distance: int = 1) -> int:
-        """Count teammates within given distance."""
-        from position import Position
-        count = 0
-        teammates = game.get_team_players(game.current_team)
+    def _score_player_moves(self, game, player_moves: List) -> List[float]:
+        """
+        Score player moves based on multiple strategic factors.
         
-        for teammate in teammates:
-            if teammate.position.distance(pos) <= distance:
-                count += 1
+        All moves are scored in one pass, with the turn-invariant values
+        (ball square, direction, defensive need, tables, weights) hoisted.
+        """
+        ctx = self._ctx
+        is_left = ctx['is_left']
+        ball_row, ball_col = ctx['ball_row'], ctx['ball_col']
+        teammates_near = self._near_counts('team_positions', 2)
+        defensive_needed = self._is_defensive_position_needed(game)
+        weight_ball_control = self.WEIGHT_BALL_CONTROL
+        weight_passing_lane = self.WEIGHT_PASSING_LANE
+        weight_defensive = self.WEIGHT_DEFENSIVE
+        forward_bonus = self.WEIGHT_ADVANCEMENT * 2
+        
+        scores = []
+        for _, from_pos, to_pos in player_moves:
+            from_row, from_col = from_pos.row, from_pos.col
+            to_row, to_col = to_pos.row, to_pos.col
+            score = 0.0
+            
+            # Factor 1: Distance to ball (Chebyshev, Position.distance inlined)
+            current_distance = max(abs(from_row - ball_row), abs(from_col - ball_col))
+            new_distance = max(abs(to_row - ball_row), abs(to_col - ball_col))
+            distance_improvement = current_distance - new_distance
+            score += weight_ball_control * distance_improvement * 5
+            
+            # Factor 2: Support positioning
+            teammates_nearby = teammates_near[to_row, to_col]
+            score += weight_passing_lane * teammates_nearby
+            
+            # Factor 3: Defensive positioning
+            if defensive_needed:
+                defensive_value = self._evaluate_defensive_position(game, to_pos)
+                score += weight_defensive * defensive_value
+            
+            # Factor 4: Quadrant positioning
+            score += self._evaluate_quadrant_value(game, to_pos, for_player=True)
+            
+            # Factor 5: Adjacent to ball bonus
+            if new_distance <= 1:
+                score += weight_ball_control * 5
+            
+            # Factor 6: Forward positioning
+            moves_forward = to_row > from_row if is_left else to_row < from_row
+            if moves_forward:
+                score += forward_bonus
+            
+            # Factor 7: Avoid clustering
+            if teammates_nearby > 2:
+                score -= 5 * (teammates_nearby - 2)
+            
+            scores.append(score)
         
-        return count
+        return scores
+    
+    def _count_teammates_near(self, game, pos, distance: int = 1) -> int:
+        """Count teammates within given distance."""
+        return self._near_counts('team_positions', distance)[pos.row, pos.col]
     
     def _count_opponents_near(self, game, pos, distance: int = 1) -> int:
         """Count opponents within given distance."""
-        count = 0
-        opponent_team = game.RIGHT if game.current_team == game.LEFT else game.LEFT
-        opponents = game.get_team_players(opponent_team)
-        
-        for opponent in opponents:
-            if opponent.position.distance(pos) <= distance:
-                count += 1
+        return self._near_counts('opp_positions', distance)[pos.row, pos.col]
+    
+    def _near_counts(self, roster: str, distance: int) -> Counter:
+        """
+        Get how many players of a cached roster are within (Chebyshev) distance
+        of each square, as a Counter keyed by (row, col).
         
-        return count
+        Built once per turn by spreading each player over its neighbourhood, so
+        scoring every candidate move is a lookup instead of a roster scan.
+        """
+        key = (roster, distance)
+        counts = self._ctx['near_counts'].get(key)
+        if counts is None:
+            offsets = range(-distance, distance + 1)
+            counts = Counter((r + dr, c + dc)
+                             for r, c in self._ctx[roster]
+                             for dr in offsets
+                             for dc in offsets)
+            self._ctx['near_counts'][key] = counts
+        return counts
     
     def _has_clear_path_to_goal(self, game, pos) -> bool:
         """Check if there's a clear path to goal."""
-        goal_row = 14 if game.current_team == game.LEFT else 0
-        goal_cols = [3, 4, 5, 6, 7]
+        is_left = self._ctx['is_left']
+        goal_cols = self.GOAL_COLS
+        row = pos.row
         
         # Check shooting range
-        if game.current_team == game.LEFT:
-            if pos.row < 10:
+        if is_left:
+            if row < 10:
                 return False
         else:
-            if pos.row > 4:
+            if row > 4:
                 return False
         
-        # Check blocking opponents
-        opponent_team = game.RIGHT if game.current_team == game.LEFT else game.LEFT
-        opponents = game.get_team_players(opponent_team)
-        
+        # Check blocking opponents: a second one already closes the path
         blocking_opponents = 0
-        for opponent in opponents:
-            if game.current_team == game.LEFT:
-                if opponent.position.row > pos.row and opponent.position.col in goal_cols:
-                    blocking_opponents += 1
-            else:
-                if opponent.position.row < pos.row and opponent.position.col in goal_cols:
-                    blocking_opponents += 1
+        for opp_row, opp_col in self._ctx['opp_positions']:
+            if (opp_row > row if is_left else opp_row < row) and opp_col in goal_cols:
+                blocking_opponents += 1
+                if blocking_opponents > 1:
+                    return False
         
-        return blocking_opponents <= 1
+        return True
     
     def _is_defensive_position_needed(self, game) -> bool:
         """Determine if defensive positioning is needed."""
-        ball_pos = game.ball.position
+        ball_row = self._ctx['ball_row']
         
-        if game.current_team == game.LEFT:
-            return ball_pos.row < 7
+        if self._ctx['is_left']:
+            return ball_row < 7
         else:
-            return ball_pos.row > 7
+            return ball_row > 7
     
     def _evaluate_defensive_position(self, game, pos) -> float:
         """Evaluate defensive positioning quality."""
-        ball_pos = game.ball.position
+        ball_row, ball_col = self._ctx['ball_row'], self._ctx['ball_col']
+        row, col = pos.row, pos.col
         
-        if game.current_team == game.LEFT:
-            if pos.row < ball_pos.row:
-                distance_to_ball = pos.distance(ball_pos)
-                return 10.0 / (distance_to_ball + 1)
-        else:
-            if pos.row > ball_pos.row:
-                distance_to_ball = pos.distance(ball_pos)
-                return 10.0 / (distance_to_ball + 1)
+        # Only squares between the ball and our own goal count
+        behind_ball = row < ball_row if self._ctx['is_left'] else row > ball_row
+        if behind_ball:
+            # Chebyshev distance (Position.distance) inlined on plain ints
+            distance_to_ball = max(abs(row - ball_row), abs(col - ball_col))
+            return 10.0 / (distance_to_ball + 1)
         
         return 0.0
     
-    def _evaluate_quadrant_value(self, game, pos, for_player: bool = False) -> float:
+    def _evaluate_quadrant_value(self, game, pos, for_player: bool = False) -> int:
         """Evaluate strategic value of quadrant."""
         quadrant = self._get_quadrant(pos)
-        ball_pos = game.ball.position
-        ball_quadrant = self._get_quadrant(ball_pos)
         
         if quadrant == 0:
-            return 0.0
+            return 0
         
-        value = 0.0
+        value = 0
         
-        if quadrant == ball_quadrant:
-            value += 5.0
+        if quadrant == self._ctx['ball_quad']:
+            value += 5
         
-        if game.current_team == game.LEFT:
-            if quadrant in [3, 4]:
-                value += 10.0
-            if not for_player:
-                target_quad = self._get_less_defended_quadrant(game, [3, 4])
-                if quadrant == target_quad:
-                    value += 8.0
-        else:
-            if quadrant in [1, 2]:
-                value += 10.0
-            if not for_player:
-                target_quad = self._get_less_defended_quadrant(game, [1, 2])
-                if quadrant == target_quad:
-                    value += 8.0
+        attack_quads = self._ctx['attack_quads']
+        if quadrant in attack_quads:
+            value += 10
+        if not for_player:
+            if quadrant == self._ctx['less_def_quad']:
+                value += 8
         
         return value
     
-    def _get_less_defended_quadrant(self, game, quadrants: List[int]) -> int:
-        """Find quadrant with fewer opponents."""
-        opponent_team = game.RIGHT if game.current_team == game.LEFT else game.LEFT
-        opponents = game.get_team_players(opponent_team)
-        
-        quad_counts = {q: 0 for q in quadrants}
-        
-        for opponent in opponents:
-            opp_quad = self._get_quadrant(opponent.position)
-            if opp_quad in quad_counts:
-                quad_counts[opp_quad] += 1
-        
-        return min(quad_counts, key=quad_counts.get)
-    
-    def _find_goal_moves(self, game, kick_moves: List) -> List:
-        """Find kicks that score a goal."""
-        goal_moves = []
-        
-        for move in kick_moves:
-            _, _, to_pos = move
-            
-            if game.current_team == game.LEFT and game.is_goal_RIGHT(to_pos):
-                goal_moves.append(move)
-            elif game.current_team == game.RIGHT and game.is_goal_LEFT(to_pos):
-                goal_moves.append(move)
-        
-        return goal_moves
+    def _get_less_defended_quadrant(self, opp_positions: List[Tuple[int, int]], quadrants: List[int]) -> int:
+        """Find which of the two quadrants has fewer opponents (the first one on a tie)."""
+        quad_a, quad_b = quadrants
+        count_a = count_b = 0
+        
+        quadrant_table = self.QUADRANT_TABLE
+        for opp_row, opp_col in opp_positions:
+            opp_quad = quadrant_table[opp_row][opp_col]
+            if opp_quad == quad_a:
+                count_a += 1
+            elif opp_quad == quad_b:
+                count_b += 1
+        
+        return quad_a if count_a <= count_b else quad_b
     
-    def _find_advancing_kicks(self, game, kick_moves: List) -> List:
-        """Find kicks that advance towards goal."""
-        current_ball_row = game.ball.position.row
-        advancing_kicks = []
-        
-        for move in kick_moves:
-            _, _, to_pos = move
-            
-            if game.current_team == game.LEFT:
-                if to_pos.row > current_ball_row:
-                    advancing_kicks.append(move)
-            else:
-                if to_pos.row < current_ball_row:
-                    advancing_kicks.append(move)
-        
-        return advancing_kicks
-    
-    def _select_best_advancing_kick(self, game, advancing_kicks: List) -> Tuple:
-        """Select best advancing kick."""
-        if len(advancing_kicks) == 1:
-            return advancing_kicks[0]
+    def _select_best_advancing_kick(self, game, kick_moves: List) -> Optional[Tuple]:
+        """
+        Select the best kick that advances towards goal.
         
+        Kicks that do not advance are skipped inside the scoring loop, so the
+        advancing kicks are filtered and ranked in a single pass.
+        """
+        ball_row = self._ctx['ball_row']
+        is_left = self._ctx['is_left']
         best_kick = None
-        best_score = float('-inf')
+        best_score = -inf
+        goal_row = self._ctx['goal_row']
+        teammates_near = self._near_counts('team_positions', 2)
+        opponents_near = self._near_counts('opp_positions', 1)
         
-        for kick in advancing_kicks:
+        for kick in kick_moves:
             _, _, to_pos = kick
+            to_row, to_col = to_pos.row, to_pos.col
+            advances = to_row > ball_row if is_left else to_row < ball_row
+            if not advances:
+                continue
             score = 0.0
             
-            goal_row = 14 if game.current_team == game.LEFT else 0
-            advancement = abs(goal_row - to_pos.row)
+            advancement = abs(goal_row - to_row)
             score += (15 - advancement) * 3
             
-            score += (5 - abs(to_pos.col - 5)) * 2
+            score += (5 - abs(to_col - 5)) * 2
             
-            teammates_nearby = self._count_teammates_near(game, to_pos, distance=2)
+            teammates_nearby = teammates_near[to_row, to_col]
             score += teammates_nearby * 2
             
-            opponents_nearby = self._count_opponents_near(game, to_pos, distance=1)
+            opponents_nearby = opponents_near[to_row, to_col]
             score -= opponents_nearby * 3
             
             if score > best_score:
                 best_score = score
                 best_kick = kick
         
-        return best_kick if best_kick else random.choice(advancing_kicks)
+        return best_kick
     
     def _get_strategic_player_move(self, game, player_moves: List) -> Optional[Tuple]:
         """Select best player move strategically."""
         if not self.advanced:
             return self._move_closest_to_ball(game, player_moves)
         
-        ball_pos = game.ball.position
-        ball_quadrant = self._get_quadrant(ball_pos)
-        
-        filtered_moves = self._filter_moves_by_zone(player_moves, ball_quadrant)
+        filtered_moves = self._filter_moves_by_zone(player_moves, self._ctx['ball_quad'])
         
         if filtered_moves:
             return self._move_closest_to_ball(game, filtered_moves)
@@ -457,20 +552,7 @@ class HeuristicAgentLevel2(BaseAgent):
     
     def _get_quadrant(self, pos) -> int:
         """Get quadrant number for position."""
-        row, col = pos.row, pos.col
-        
-        if 7 <= row <= 13:
-            if 0 <= col <= 5:
-                return 1
-            elif 6 <= col <= 10:
-                return 2
-        elif 1 <= row <= 6:
-            if 0 <= col <= 5:
-                return 3
-            elif 6 <= col <= 10:
-                return 4
-        
-        return 0
+        return self.QUADRANT_TABLE[pos.row][pos.col]
     
     def _filter_moves_by_zone(self, player_moves: List, ball_quadrant: int) -> List:
         """Filter moves by relevant zones."""
@@ -495,19 +577,18 @@ class HeuristicAgentLevel2(BaseAgent):
     
     def _move_closest_to_ball(self, game, player_moves: List) -> Optional[Tuple]:
         """Find player move closest to ball."""
-        ball_pos = game.ball.position
+        ball_row, ball_col = self._ctx['ball_row'], self._ctx['ball_col']
+        is_left = self._ctx['is_left']
         best_move = None
-        min_distance = float('inf')
-        best_advancement = float('-inf')
+        min_distance = inf
+        best_advancement = -inf
         
         for move in player_moves:
             _, from_pos, to_pos = move
-            new_distance = to_pos.distance(ball_pos)
-            
-            if game.current_team == game.LEFT:
-                advancement = to_pos.row - from_pos.row
-            else:
-                advancement = from_pos.row - to_pos.row
+            to_row = to_pos.row
+            # Chebyshev distance (Position.distance) inlined on plain ints
+            new_distance = max(abs(to_row - ball_row), abs(to_pos.col - ball_col))
+            advancement = to_row - from_pos.row if is_left else from_pos.row - to_row
             
             if new_distance < min_distance or (new_distance == min_distance and advancement > best_advancement):
                 min_distance = new_distance
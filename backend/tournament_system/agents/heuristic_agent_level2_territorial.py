@@ -5,8 +5,38 @@ Strategy: Dominate field zones and apply constant pressure rather than direct go
 
 import time
 import random
+from collections import Counter
 from typing import Any, Tuple, List, Optional, Dict, Set
 from agents.base_agent import BaseAgent, GameLogic
+from position import Position
+
+
+def _zone_at(row: int, col: int) -> int:
+    """Get zone ID for an on-board square."""
+    # Same boundaries as _create_zone_map: rows 0-4 / 5-9 / 10-14, cols 0-2 / 3-6 / 7-10
+    return ((row >= 5) + (row >= 10)) * 3 + (col >= 3) + (col >= 7)
+
+
+def _adjacent_zones(zone_id: int) -> List[int]:
+    """Get zones adjacent to a given zone in the 3x3 grid."""
+    adjacent = []
+    
+    # 3x3 grid adjacency
+    row = zone_id // 3
+    col = zone_id % 3
+    
+    for dr in [-1, 0, 1]:
+        for dc in [-1, 0, 1]:
+            if dr == 0 and dc == 0:
+                continue
+            
+            new_row = row + dr
+            new_col = col + dc
+            
+            if 0 <= new_row < 3 and 0 <= new_col < 3:
+                adjacent.append(new_row * 3 + new_col)
+    
+    return adjacent
 
 
 class HeuristicTerritorialControl(BaseAgent):
@@ -27,6 +57,12 @@ class HeuristicTerritorialControl(BaseAgent):
     - Opportunistic Finishing: Strike when zones are controlled
     """
     
+    # Zone ID of every square, indexed [row][col]
+    ZONE_TABLE = tuple(tuple(_zone_at(row, col) for col in range(11)) for row in range(15))
+    
+    # Adjacent zones of each of the 9 zones, computed once
+    ADJACENT_ZONES = tuple(tuple(_adjacent_zones(zone_id)) for zone_id in range(9))
+    
     def __init__(self, name: str, level: int, pressure_intensity: str = "high"):
         """
         Initialize Territorial Control agent.
@@ -39,6 +75,8 @@ class HeuristicTerritorialControl(BaseAgent):
         super().__init__(name, level, GameLogic.STANDARD)
         self.team = None
         self.pressure_intensity = pressure_intensity
+        # Squares of the goal we attack as (row, col), built once per side
+        self.goal_squares = {}
         
         # Field dimensions
         self.field_rows = 15
@@ -104,46 +142,37 @@ class HeuristicTerritorialControl(BaseAgent):
     
     def _get_position_zone(self, pos) -> int:
         """Get zone ID for a position."""
-        for zone_id, zone_info in self.zone_definitions.items():
-            row_min, row_max = zone_info['row_range']
-            col_min, col_max = zone_info['col_range']
-            
-            if row_min <= pos.row < row_max and col_min <= pos.col < col_max:
-                return zone_id
+        row, col = pos.row, pos.col
+        if not (0 <= row < self.field_rows and 0 <= col < self.field_cols):
+            return -1
         
-        return -1
+        return self.ZONE_TABLE[row][col]
     
     def set_team(self, team: str):
         """Set the team this agent is playing as."""
         self.team = team
     
     def get_move(self, game_state: Any, time_limit: float = 60.0) -> Tuple[Any, float]:
-        """Get the best move using territorial control strategy."""
-        start_time = time.time()
+        """
+        Get the best move using territorial control strategy.
         
-        try:
-            legal_moves = game_state.get_legal_moves()
-            
-            if not legal_moves:
-                raise RuntimeError(f"No valid moves for {self.name}")
-            
-            # Apply territorial control heuristic
-            move = self._select_territorial_move(game_state, legal_moves)
-            
-            thinking_time = time.time() - start_time
-            self.total_thinking_time += thinking_time
-            
-            return move, thinking_time
-            
-        except Exception as e:
-            thinking_time = time.time() - start_time
-            print(f"Error in {self.name}.get_move: {e}")
-            
-            # Fallback: random move
-            if legal_moves:
-                return random.choice(legal_moves), thinking_time
-            else:
-                raise RuntimeError(f"No valid moves for {self.name}")
+        Errors are not swallowed here: the callers (AIManager.get_ai_move and
+        get_move_chain) already report them and fall back to a random move.
+        """
+        start_time = time.perf_counter()
+        
+        legal_moves = game_state.get_legal_moves()
+        
+        if not legal_moves:
+            raise RuntimeError(f"No valid moves for {self.name}")
+        
+        # Apply territorial control heuristic
+        move = self._select_territorial_move(game_state, legal_moves)
+        
+        thinking_time = time.perf_counter() - start_time
+        self.total_thinking_time += thinking_time
+        
+        return move, thinking_time
     
     def reset(self):
         """Reset agent state between games."""
@@ -161,7 +190,7 @@ class HeuristicTerritorialControl(BaseAgent):
         player_moves = [m for m in moves if m[0] == 'move']
         
         # Priority 1: Immediate goal (always take it)
-        goal_moves = self._find_goal_moves(game, kick_moves)
+        goal_moves = self._find_goal_moves(game, kick_moves, state_analysis['is_left'])
         if goal_moves:
             return random.choice(goal_moves)
         
@@ -170,13 +199,13 @@ class HeuristicTerritorialControl(BaseAgent):
         
         if game_phase == "PRESS":
             # Aggressive: Apply pressure on ball
-            move = self._select_pressing_move(game, moves, state_analysis)
+            move = self._select_pressing_move(game, player_moves, kick_moves, state_analysis)
             if move:
                 return move
         
         elif game_phase == "CONTROL":
             # Controlled possession: Dominate zones methodically
-            move = self._select_control_move(game, moves, state_analysis)
+            move = self._select_control_move(game, player_moves, kick_moves, state_analysis)
             if move:
                 return move
         
@@ -196,42 +225,76 @@ class HeuristicTerritorialControl(BaseAgent):
     def _analyze_game_state(self, game) -> Dict:
         """Analyze current territorial control and pressure."""
         ball_pos = game.ball.position
+        ball_row, ball_col = ball_pos.row, ball_pos.col
+        # Team orientation, resolved once for every selector
+        is_left = game.current_team == game.LEFT
         teammates = game.get_team_players(game.current_team)
-        opponent_team = game.RIGHT if game.current_team == game.LEFT else game.LEFT
+        opponent_team = game.RIGHT if is_left else game.LEFT
         opponents = game.get_team_players(opponent_team)
-        
-        # Zone control: count players in each zone
-        zone_control = {i: {'teammates': 0, 'opponents': 0} for i in range(9)}
+        # Squares as plain (row, col) ints, read by the scoring loops
+        teammate_squares = [(p.position.row, p.position.col) for p in teammates]
+        opponent_squares = [(p.position.row, p.position.col) for p in opponents]
+        
+        # Zone control: count players in each zone, and pressure on ball
+        # (players within 2 of it, Chebyshev as Position.distance), in a
+        # single pass over each team
+        # teammate_counts[zone] / opponent_counts[zone]
+        teammate_counts = [0] * 9
+        opponent_counts = [0] * 9
+        teammates_near_ball = 0
+        opponents_near_ball = 0
         
         for player in teammates:
-            zone = self._get_position_zone(player.position)
+            pos = player.position
+            zone = self._get_position_zone(pos)
             if zone >= 0:
-                zone_control[zone]['teammates'] += 1
+                teammate_counts[zone] += 1
+            if max(abs(pos.row - ball_row), abs(pos.col - ball_col)) <= 2:
+                teammates_near_ball += 1
         
         for opponent in opponents:
-            zone = self._get_position_zone(opponent.position)
+            pos = opponent.position
+            zone = self._get_position_zone(pos)
             if zone >= 0:
-                zone_control[zone]['opponents'] += 1
+                opponent_counts[zone] += 1
+            if max(abs(pos.row - ball_row), abs(pos.col - ball_col)) <= 2:
+                opponents_near_ball += 1
         
         # Ball zone
         ball_zone = self._get_position_zone(ball_pos)
         
-        # Pressure on ball
-        opponents_near_ball = sum(1 for opp in opponents if opp.position.distance(ball_pos) <= 2)
-        teammates_near_ball = sum(1 for tm in teammates if tm.position.distance(ball_pos) <= 2)
+        # Zones where one side outnumbers the other
+        controlled_zones = 0
+        threatened_zones = 0
+        for teammate_count, opponent_count in zip(teammate_counts, opponent_counts):
+            if teammate_count > opponent_count:
+                controlled_zones += 1
+            elif opponent_count > teammate_count:
+                threatened_zones += 1
         
         # Team spacing
-        avg_spacing = self._calculate_team_spacing(teammates)
+        avg_spacing = self._calculate_team_spacing(teammate_squares)
         
         return {
-            'zone_control': zone_control,
+            'teammate_counts': teammate_counts,
+            'opponent_counts': opponent_counts,
             'ball_zone': ball_zone,
             'ball_pos': ball_pos,
+            'teammates': teammates,
+            'teammate_squares': teammate_squares,
+            'opponents': opponents,
+            'opponent_squares': opponent_squares,
+            'opponent_team': opponent_team,
+            'is_left': is_left,
+            'goal_row': 14 if is_left else 0,
+            # Row direction of attack
+            'forward_sign': 1 if is_left else -1,
+            'attacking_zones': (6, 7, 8) if is_left else (0, 1, 2),
             'opponents_near_ball': opponents_near_ball,
             'teammates_near_ball': teammates_near_ball,
             'avg_spacing': avg_spacing,
-            'controlled_zones': sum(1 for z in zone_control.values() if z['teammates'] > z['opponents']),
-            'threatened_zones': sum(1 for z in zone_control.values() if z['opponents'] > z['teammates'])
+            'controlled_zones': controlled_zones,
+            'threatened_zones': threatened_zones
         }
     
     def _determine_game_phase(self, game, state: Dict) -> str:
@@ -244,20 +307,17 @@ class HeuristicTerritorialControl(BaseAgent):
             "STRIKE" - Attack with controlled zones
         """
         ball_zone = state['ball_zone']
-        zone_control = state['zone_control']
+        teammate_counts = state['teammate_counts']
+        opponent_counts = state['opponent_counts']
         
-        # Adjust zones based on team
-        if game.current_team == game.LEFT:
-            attacking_zones = [6, 7, 8]
-            middle_zones = [3, 4, 5]
-        else:
-            attacking_zones = [0, 1, 2]
-            middle_zones = [3, 4, 5]
+        # Zones depend on team
+        attacking_zones = state['attacking_zones']
+        middle_zones = [3, 4, 5]
         
         # Check if ball is in attacking third
         if ball_zone in attacking_zones:
             # Check if we control this zone
-            if zone_control[ball_zone]['teammates'] >= zone_control[ball_zone]['opponents']:
+            if teammate_counts[ball_zone] >= opponent_counts[ball_zone]:
                 return "STRIKE"
             else:
                 return "PRESS"  # Need to win ball back
@@ -275,50 +335,65 @@ class HeuristicTerritorialControl(BaseAgent):
         # Ball in defensive third
         return "PRESS"  # Always press in defense
     
-    def _select_pressing_move(self, game, moves: List, state: Dict) -> Optional[Tuple]:
+    def _select_pressing_move(self, game, player_moves: List, kick_moves: List, state: Dict) -> Optional[Tuple]:
         """Select move that applies maximum pressure on opponent."""
+        # If we can kick, clear danger or advance
+        for move in kick_moves:
+            if self._is_clearing_kick(move[2], state):
+                return move  # Immediate clear
+        
         ball_pos = state['ball_pos']
+        ball_row, ball_col = ball_pos.row, ball_pos.col
+        opponents = state['opponents']
         
         # Prioritize moves that get closest to ball
         best_move = None
         best_pressure_score = float('-inf')
         
-        for move in moves:
-            move_type, from_pos, to_pos = move
+        for move in player_moves:
+            _, from_pos, to_pos = move
+            
+            # Calculate pressure applied (Chebyshev, Position.distance inlined)
+            new_distance = max(abs(to_pos.row - ball_row), abs(to_pos.col - ball_col))
+            
+            # Prefer getting very close (adjacent)
+            if new_distance <= 1:
+                pressure_score = 100
+            else:
+                pressure_score = 50 / (new_distance + 1)
             
-            if move_type == 'move':
-                # Calculate pressure applied
-                new_distance = to_pos.distance(ball_pos)
-                
-                # Prefer getting very close (adjacent)
-                if new_distance <= 1:
-                    pressure_score = 100
-                else:
-                    pressure_score = 50 / (new_distance + 1)
-                
-                # Bonus for cutting passing lanes
-                opponents = game.get_team_players(
-                    game.RIGHT if game.current_team == game.LEFT else game.LEFT
-                )
-                for opp in opponents:
-                    if self._is_between(to_pos, ball_pos, opp.position):
-                        pressure_score += 20
-                
-                if pressure_score > best_pressure_score:
-                    best_pressure_score = pressure_score
-                    best_move = move
+            # Bonus for cutting passing lanes
+            for opp in opponents:
+                if self._is_between(to_pos, ball_pos, opp.position):
+                    pressure_score += 20
             
-            elif move_type == 'kick':
-                # If we can kick, clear danger or advance
-                if self._is_clearing_kick(game, to_pos):
-                    return move  # Immediate clear
+            if pressure_score > best_pressure_score:
+                best_pressure_score = pressure_score
+                best_move = move
         
         return best_move
     
-    def _select_control_move(self, game, moves: List, state: Dict) -> Optional[Tuple]:
+    def _select_control_move(self, game, player_moves: List, kick_moves: List, state: Dict) -> Optional[Tuple]:
         """Select move that maximizes zone control and maintains shape."""
-        zone_control = state['zone_control']
+        teammate_counts = state['teammate_counts']
+        opponent_counts = state['opponent_counts']
         ball_zone = state['ball_zone']
+        teammate_squares = state['teammate_squares']
+        attacking_zones = state['attacking_zones']
+        forward_sign = state['forward_sign']
+        
+        # Controlled pass to teammate in good position: any kick landing
+        # within 1 of a teammate in an advanced (attacking) zone
+        if kick_moves:
+            zone_table = self.ZONE_TABLE
+            advanced_squares = [(row, col) for row, col in teammate_squares
+                                if zone_table[row][col] in attacking_zones]
+            if advanced_squares:
+                pass_squares = self._near_counts(advanced_squares, 1)
+                for move in kick_moves:
+                    to_pos = move[2]
+                    if pass_squares[to_pos.row, to_pos.col]:
+                        return move  # Good attacking pass
         
         # Find undercontrolled zones that need reinforcement
         target_zones = []
@@ -326,50 +401,32 @@ class HeuristicTerritorialControl(BaseAgent):
         # Prioritize zones adjacent to ball zone
         adjacent_zones = self._get_adjacent_zones(ball_zone)
         for zone_id in adjacent_zones:
-            if zone_control[zone_id]['teammates'] <= zone_control[zone_id]['opponents']:
+            if teammate_counts[zone_id] <= opponent_counts[zone_id]:
                 target_zones.append(zone_id)
         
         # Evaluate moves
         best_move = None
         best_control_score = float('-inf')
         
-        for move in moves:
-            move_type, from_pos, to_pos = move
+        for move in player_moves:
+            _, from_pos, to_pos = move
+            target_zone = self._get_position_zone(to_pos)
+            control_score = 0
+            
+            # Bonus for reinforcing target zones
+            if target_zone in target_zones:
+                control_score += self.CONTROL_BONUS
             
-            if move_type == 'move':
-                target_zone = self._get_position_zone(to_pos)
-                control_score = 0
-                
-                # Bonus for reinforcing target zones
-                if target_zone in target_zones:
-                    control_score += self.CONTROL_BONUS
-                
-                # Bonus for maintaining spacing
-                teammates = game.get_team_players(game.current_team)
-                spacing_quality = self._evaluate_spacing_quality(to_pos, teammates)
-                control_score += spacing_quality * 10
-                
-                # Bonus for advancing position gradually
-                if game.current_team == game.LEFT:
-                    control_score += (to_pos.row - from_pos.row) * 2
-                else:
-                    control_score += (from_pos.row - to_pos.row) * 2
-                
-                if control_score > best_control_score:
-                    best_control_score = control_score
-                    best_move = move
+            # Bonus for maintaining spacing
+            spacing_quality = self._evaluate_spacing_quality(to_pos, teammate_squares)
+            control_score += spacing_quality * 10
             
-            elif move_type == 'kick':
-                # Controlled pass to teammate in good position
-                teammates = game.get_team_players(game.current_team)
-                for teammate in teammates:
-                    if teammate.position.distance(to_pos) <= 1:
-                        # Check if teammate is in advanced position
-                        tm_zone = self._get_position_zone(teammate.position)
-                        if game.current_team == game.LEFT and tm_zone >= 6:
-                            return move  # Good attacking pass
-                        elif game.current_team == game.RIGHT and tm_zone <= 2:
-                            return move
+            # Bonus for advancing position gradually
+            control_score += (to_pos.row - from_pos.row) * forward_sign * 2
+            
+            if control_score > best_control_score:
+                best_control_score = control_score
+                best_move = move
         
         return best_move
     
@@ -378,28 +435,27 @@ class HeuristicTerritorialControl(BaseAgent):
         if not kick_moves:
             return None
         
-        goal_row = 14 if game.current_team == game.LEFT else 0
+        goal_row = state['goal_row']
+        opponents_near_square = self._near_counts(state['opponent_squares'], 2)
         
         best_kick = None
         best_strike_score = float('-inf')
         
         for move in kick_moves:
             _, _, to_pos = move
+            to_row, to_col = to_pos.row, to_pos.col
             strike_score = 0
             
             # Distance to goal
-            goal_distance = abs(to_pos.row - goal_row)
+            goal_distance = abs(to_row - goal_row)
             strike_score += (15 - goal_distance) * 5
             
             # Center alignment
-            center_distance = abs(to_pos.col - 5)
+            center_distance = abs(to_col - 5)
             strike_score += (5 - center_distance) * 3
             
             # Free from opponents
-            opponents = game.get_team_players(
-                game.RIGHT if game.current_team == game.LEFT else game.LEFT
-            )
-            opponents_near = sum(1 for opp in opponents if opp.position.distance(to_pos) <= 2)
+            opponents_near = opponents_near_square[to_row, to_col]
             strike_score -= opponents_near * 10
             
             if strike_score > best_strike_score:
@@ -410,8 +466,10 @@ class HeuristicTerritorialControl(BaseAgent):
     
     def _select_formation_move(self, game, player_moves: List, state: Dict) -> Tuple:
         """Select move that maintains formation integrity."""
-        teammates = game.get_team_players(game.current_team)
+        teammate_squares = state['teammate_squares']
         ball_pos = state['ball_pos']
+        ball_row, ball_col = ball_pos.row, ball_pos.col
+        forward_sign = state['forward_sign']
         
         best_move = None
         best_formation_score = float('-inf')
@@ -421,19 +479,16 @@ class HeuristicTerritorialControl(BaseAgent):
             formation_score = 0
             
             # Spacing quality
-            spacing_quality = self._evaluate_spacing_quality(to_pos, teammates)
+            spacing_quality = self._evaluate_spacing_quality(to_pos, teammate_squares)
             formation_score += spacing_quality * 15
             
             # Move towards ball (but maintain spacing)
-            distance_to_ball = to_pos.distance(ball_pos)
+            distance_to_ball = max(abs(to_pos.row - ball_row), abs(to_pos.col - ball_col))
             if 2 <= distance_to_ball <= 4:  # Optimal support distance
                 formation_score += 20
             
             # Gradual advancement
-            if game.current_team == game.LEFT:
-                formation_score += (to_pos.row - from_pos.row) * 3
-            else:
-                formation_score += (from_pos.row - to_pos.row) * 3
+            formation_score += (to_pos.row - from_pos.row) * forward_sign * 3
             
             if formation_score > best_formation_score:
                 best_formation_score = formation_score
@@ -443,39 +498,48 @@ class HeuristicTerritorialControl(BaseAgent):
     
     # Helper methods
     
-    def _find_goal_moves(self, game, kick_moves: List) -> List:
+    def _find_goal_moves(self, game, kick_moves: List, is_left: bool) -> List:
         """Find kicks that score a goal."""
-        goal_moves = []
-        for move in kick_moves:
-            _, _, to_pos = move
-            if game.current_team == game.LEFT and game.is_goal_RIGHT(to_pos):
-                goal_moves.append(move)
-            elif game.current_team == game.RIGHT and game.is_goal_LEFT(to_pos):
-                goal_moves.append(move)
-        return goal_moves
+        goal_squares = self.goal_squares.get(is_left)
+        if goal_squares is None:
+            # The goal we attack
+            is_goal = game.is_goal_RIGHT if is_left else game.is_goal_LEFT
+            goal_squares = frozenset(
+                (row, col)
+                for row in range(game.ROWS)
+                for col in range(game.COLS)
+                if is_goal(Position(row, col))
+            )
+            self.goal_squares[is_left] = goal_squares
+        
+        return [move for move in kick_moves if (move[2].row, move[2].col) in goal_squares]
     
-    def _calculate_team_spacing(self, players: List) -> float:
-        """Calculate average spacing between teammates."""
-        if len(players) <= 1:
+    def _calculate_team_spacing(self, squares: List[Tuple[int, int]]) -> float:
+        """Calculate average spacing between teammates, given their (row, col) squares."""
+        if len(squares) <= 1:
             return 0.0
         
         total_distance = 0
         count = 0
         
-        for i, p1 in enumerate(players):
-            for p2 in players[i+1:]:
-                total_distance += p1.position.distance(p2.position)
+        # Chebyshev distance (Position.distance) inlined on plain ints
+        for i, (row1, col1) in enumerate(squares):
+            for row2, col2 in squares[i+1:]:
+                total_distance += max(abs(row1 - row2), abs(col1 - col2))
                 count += 1
         
         return total_distance / count if count > 0 else 0.0
     
-    def _evaluate_spacing_quality(self, pos, teammates: List) -> float:
+    def _evaluate_spacing_quality(self, pos, teammate_squares: List[Tuple[int, int]]) -> float:
         """Evaluate how well a position maintains optimal spacing."""
-        if not teammates:
+        if not teammate_squares:
             return 0.0
         
-        distances = [pos.distance(tm.position) for tm in teammates]
-        avg_distance = sum(distances) / len(distances)
+        row, col = pos.row, pos.col
+        total_distance = 0
+        for tm_row, tm_col in teammate_squares:
+            total_distance += max(abs(row - tm_row), abs(col - tm_col))
+        avg_distance = total_distance / len(teammate_squares)
         
         # Optimal spacing is around 3.5-4.5
         deviation = abs(avg_distance - self.OPTIMAL_SPACING)
@@ -483,47 +547,45 @@ class HeuristicTerritorialControl(BaseAgent):
         # Score: 0 to 10 based on deviation
         return max(0, 10 - deviation * 2)
     
-    def _get_adjacent_zones(self, zone_id: int) -> List[int]:
+    def _near_counts(self, squares: List[Tuple[int, int]], radius: int) -> Counter:
+        """
+        Get how many of the given squares are within (Chebyshev) radius of
+        each board square, as a Counter keyed by (row, col).
+        
+        Each square is spread over its neighbourhood once, so a neighbour
+        query for a candidate target is a lookup instead of a roster scan.
+        """
+        offsets = range(-radius, radius + 1)
+        return Counter((row + dr, col + dc)
+                       for row, col in squares
+                       for dr in offsets
+                       for dc in offsets)
+    
+    def _get_adjacent_zones(self, zone_id: int) -> Tuple[int, ...]:
         """Get adjacent zones to a given zone."""
-        adjacent = []
-        
-        # 3x3 grid adjacency
-        row = zone_id // 3
-        col = zone_id % 3
-        
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue
-                
-                new_row = row + dr
-                new_col = col + dc
-                
-                if 0 <= new_row < 3 and 0 <= new_col < 3:
-                    adjacent.append(new_row * 3 + new_col)
-        
-        return adjacent
+        if 0 <= zone_id < 9:
+            return self.ADJACENT_ZONES[zone_id]
+        return tuple(_adjacent_zones(zone_id))
     
     def _is_between(self, pos, point_a, point_b) -> bool:
         """Check if position is roughly between two points (intercepts pass)."""
         # Simple check: is pos closer to midpoint than either endpoint?
-        mid_row = (point_a.row + point_b.row) / 2
-        mid_col = (point_a.col + point_b.col) / 2
+        # Midpoint square (coordinates are non-negative, so // truncates like int())
+        mid_row = (point_a.row + point_b.row) // 2
+        mid_col = (point_a.col + point_b.col) // 2
         
-        from position import Position
-        midpoint = Position(int(mid_row), int(mid_col))
-        
-        dist_to_mid = pos.distance(midpoint)
-        dist_a_to_mid = point_a.distance(midpoint)
+        # Chebyshev distances (Position.distance) on plain ints
+        dist_to_mid = max(abs(pos.row - mid_row), abs(pos.col - mid_col))
+        dist_a_to_mid = max(abs(point_a.row - mid_row), abs(point_a.col - mid_col))
         
         return dist_to_mid < dist_a_to_mid * 0.7
     
-    def _is_clearing_kick(self, game, to_pos) -> bool:
+    def _is_clearing_kick(self, to_pos, state: Dict) -> bool:
         """Check if kick clears ball away from danger."""
         # If ball is in defensive zone, kick to middle/attack is clearing
-        ball_pos = game.ball.position
+        ball_pos = state['ball_pos']
         
-        if game.current_team == game.LEFT:
+        if state['is_left']:
             # Clear if moving ball from rows 0-5 to 6+
             return ball_pos.row < 6 and to_pos.row >= 6
         else:
@@ -9,6 +9,7 @@ import random
 import math
 from typing import Any, Tuple, List, Optional, Dict, Set
 from agents.base_agent import BaseAgent, GameLogic
+from position import Position
 
 
 class HeuristicTriangleFormation(BaseAgent):
@@ -46,6 +47,9 @@ class HeuristicTriangleFormation(BaseAgent):
         self.field_rows = 15
         self.field_cols = 11
         
+        # Opponent goal squares as (row, col), built once per team
+        self.goal_squares = {}
+        
         # Set triangle parameters based on style
         self._set_triangle_parameters(triangle_style)
     
@@ -154,13 +158,14 @@ class HeuristicTriangleFormation(BaseAgent):
     
     def _get_active_triangle_players(self, teammates: List, ball_pos) -> List:
         """Get 3 players closest to ball to form active triangle."""
-        # Calculate distances
-        player_distances = [(p, p.position.distance(ball_pos)) for p in teammates]
-        
-        # Sort by distance and take 3 closest
-        player_distances.sort(key=lambda x: x[1])
-        
-        return [p for p, _ in player_distances[:3]]
+        # Sort by distance and take 3 closest (a stable sort keeps roster order
+        # on ties; with at most 5 players it beats a partial selection)
+        ball_row = ball_pos.row
+        ball_col = ball_pos.col
+        return sorted(
+            teammates,
+            key=lambda p: max(abs(p.position.row - ball_row), abs(p.position.col - ball_col))
+        )[:3]
     
     def _evaluate_triangle_quality(self, triangle_players: List, ball_pos) -> float:
         """
@@ -179,10 +184,16 @@ class HeuristicTriangleFormation(BaseAgent):
         p2 = triangle_players[1].position
         p3 = triangle_players[2].position
         
-        # Calculate side lengths
-        d12 = p1.distance(p2)
-        d23 = p2.distance(p3)
-        d31 = p3.distance(p1)
+        return self._triangle_quality_at(p1.row, p1.col, p2.row, p2.col, p3.row, p3.col,
+                                         ball_pos.row, ball_pos.col)
+    
+    def _triangle_quality_at(self, r1: int, c1: int, r2: int, c2: int, r3: int, c3: int,
+                             ball_row: int, ball_col: int) -> float:
+        """Triangle quality (see _evaluate_triangle_quality) from plain coordinates."""
+        # Calculate side lengths (Chebyshev, Position.distance inlined)
+        d12 = max(abs(r1 - r2), abs(c1 - c2))
+        d23 = max(abs(r2 - r3), abs(c2 - c3))
+        d31 = max(abs(r3 - r1), abs(c3 - c1))
         
         # Check spacing (prefer IDEAL_TRIANGLE_DISTANCE)
         avg_distance = (d12 + d23 + d31) / 3
@@ -193,8 +204,11 @@ class HeuristicTriangleFormation(BaseAgent):
         min_angle = min(angles)
         angle_score = min(1.0, min_angle / self.MIN_ANGLE) if min_angle > 0 else 0.0
         
-        # Check if ball is near triangle
-        ball_to_center = self._triangle_center(p1, p2, p3).distance(ball_pos)
+        # Check if ball is near triangle: distance to the centroid square
+        # (coordinates are non-negative, so // truncates like int())
+        center_row = (r1 + r2 + r3) // 3
+        center_col = (c1 + c2 + c3) // 3
+        ball_to_center = max(abs(center_row - ball_row), abs(center_col - ball_col))
         ball_proximity_score = 1.0 / (1.0 + ball_to_center)
         
         # Combined score
@@ -204,34 +218,24 @@ class HeuristicTriangleFormation(BaseAgent):
     
     def _calculate_triangle_angles(self, d12: float, d23: float, d31: float) -> List[float]:
         """Calculate all three angles of a triangle given side lengths."""
-        angles = []
+        # A zero-length side has no defined angles
+        if not (d12 and d23 and d31):
+            return [60, 60, 60]  # Fallback to equilateral
         
         # Use law of cosines: cos(C) = (a² + b² - c²) / (2ab)
-        try:
-            # Angle at vertex 1
-            cos_angle1 = (d12**2 + d31**2 - d23**2) / (2 * d12 * d31)
-            angle1 = math.degrees(math.acos(max(-1, min(1, cos_angle1))))
-            
-            # Angle at vertex 2
-            cos_angle2 = (d12**2 + d23**2 - d31**2) / (2 * d12 * d23)
-            angle2 = math.degrees(math.acos(max(-1, min(1, cos_angle2))))
-            
-            # Angle at vertex 3
-            cos_angle3 = (d23**2 + d31**2 - d12**2) / (2 * d23 * d31)
-            angle3 = math.degrees(math.acos(max(-1, min(1, cos_angle3))))
-            
-            angles = [angle1, angle2, angle3]
-        except:
-            angles = [60, 60, 60]  # Fallback to equilateral
+        # Angle at vertex 1
+        cos_angle1 = (d12**2 + d31**2 - d23**2) / (2 * d12 * d31)
+        angle1 = math.degrees(math.acos(max(-1, min(1, cos_angle1))))
         
-        return angles
-    
-    def _triangle_center(self, p1, p2, p3):
-        """Calculate centroid of triangle."""
-        from position import Position
-        center_row = (p1.row + p2.row + p3.row) / 3
-        center_col = (p1.col + p2.col + p3.col) / 3
-        return Position(int(center_row), int(center_col))
+        # Angle at vertex 2
+        cos_angle2 = (d12**2 + d23**2 - d31**2) / (2 * d12 * d23)
+        angle2 = math.degrees(math.acos(max(-1, min(1, cos_angle2))))
+        
+        # Angle at vertex 3
+        cos_angle3 = (d23**2 + d31**2 - d12**2) / (2 * d23 * d31)
+        angle3 = math.degrees(math.acos(max(-1, min(1, cos_angle3))))
+        
+        return [angle1, angle2, angle3]
     
     def _select_triangle_pass(self, game, kick_moves: List, active_players: List, ball_pos) -> Optional[Tuple]:
         """
@@ -244,10 +248,12 @@ class HeuristicTriangleFormation(BaseAgent):
         
         for move in kick_moves:
             _, _, to_pos = move
+            to_row = to_pos.row
+            to_col = to_pos.col
             
-            # Check if pass lands near triangle player
+            # Check if pass lands near triangle player (Chebyshev distance)
             for player in active_players:
-                if player.position.distance(to_pos) <= 1:
+                if abs(player.position.row - to_row) <= 1 and abs(player.position.col - to_col) <= 1:
                     score = 0
                     
                     # Bonus for advancing
@@ -281,50 +287,53 @@ class HeuristicTriangleFormation(BaseAgent):
         best_move = None
         best_improvement = float('-inf')
         
+        # Who stands on each square, and which players form the triangle
+        player_at = {(p.position.row, p.position.col): p for p in active_players + support_players}
+        active_index = {id(p): i for i, p in enumerate(active_players)}
+        
+        # Quality of the current triangle, the baseline for every candidate
+        old_quality = self._evaluate_triangle_quality(active_players, ball_pos)
+        triangle_coords = [c for p in active_players for c in (p.position.row, p.position.col)]
+        ball_row = ball_pos.row
+        ball_col = ball_pos.col
+        
         for move in player_moves:
             _, from_pos, to_pos = move
             
             # Find which player is moving
-            moving_player = None
-            for p in active_players + support_players:
-                if p.position.row == from_pos.row and p.position.col == from_pos.col:
-                    moving_player = p
-                    break
+            moving_player = player_at.get((from_pos.row, from_pos.col))
             
             if not moving_player:
                 continue
             
-            # Simulate move and evaluate triangle quality
-            original_pos = moving_player.position
-            moving_player.position = to_pos
-            
-            # Re-evaluate triangle
-            if moving_player in active_players:
-                new_quality = self._evaluate_triangle_quality(active_players, ball_pos)
+            # Re-evaluate triangle with the moving player on to_pos
+            index = active_index.get(id(moving_player))
+            if index is not None:
+                if len(triangle_coords) == 6:
+                    candidate = list(triangle_coords)
+                    candidate[2 * index] = to_pos.row
+                    candidate[2 * index + 1] = to_pos.col
+                    new_quality = self._triangle_quality_at(*candidate, ball_row, ball_col)
+                else:
+                    new_quality = 0.0
                 
                 # Calculate improvement
-                moving_player.position = original_pos
-                old_quality = self._evaluate_triangle_quality(active_players, ball_pos)
-                
                 improvement = new_quality - old_quality
                 
                 # Bonus for getting closer to ball
-                old_dist = original_pos.distance(ball_pos)
-                new_dist = to_pos.distance(ball_pos)
+                old_dist = max(abs(from_pos.row - ball_row), abs(from_pos.col - ball_col))
+                new_dist = max(abs(to_pos.row - ball_row), abs(to_pos.col - ball_col))
                 if new_dist < old_dist:
                     improvement += 0.1
                 
             else:
                 # Support player: maintain good support distance
                 improvement = 0
-                support_dist = to_pos.distance(ball_pos)
+                support_dist = max(abs(to_pos.row - ball_row), abs(to_pos.col - ball_col))
                 
                 if abs(support_dist - self.SUPPORT_DISTANCE) < 2.0:
                     improvement += 0.2
             
-            # Restore position
-            moving_player.position = original_pos
-            
             if improvement > best_improvement:
                 best_improvement = improvement
                 best_move = move
@@ -338,28 +347,32 @@ class HeuristicTriangleFormation(BaseAgent):
         """
         goal_row = 14 if game.current_team == game.LEFT else 0
         
-        advancing_passes = []
+        # Squares within (Chebyshev) distance 2 of a teammate, collected once
+        # so each candidate target is a lookup instead of a roster scan
+        near_teammate = {
+            (teammate.position.row + dr, teammate.position.col + dc)
+            for teammate in teammates
+            for dr in range(-2, 3)
+            for dc in range(-2, 3)
+        }
+        
+        # Choose pass with most advancement (the first one on ties)
+        current_distance = abs(ball_pos.row - goal_row)
+        best_pass = None
+        best_advancement = 0
         
         for move in kick_moves:
-            _, _, to_pos = move
+            to_pos = move[2]
             
             # Check advancement
-            current_distance = abs(ball_pos.row - goal_row)
-            new_distance = abs(to_pos.row - goal_row)
+            advancement = current_distance - abs(to_pos.row - goal_row)
             
-            if new_distance < current_distance:
-                # Check if teammate nearby
-                for teammate in teammates:
-                    if teammate.position.distance(to_pos) <= 2:
-                        advancing_passes.append((move, current_distance - new_distance))
-                        break
-        
-        if advancing_passes:
-            # Choose pass with most advancement
-            advancing_passes.sort(key=lambda x: -x[1])
-            return advancing_passes[0][0]
-        
-        return None
+            # Check if teammate nearby
+            if advancement > best_advancement and (to_pos.row, to_pos.col) in near_teammate:
+                best_advancement = advancement
+                best_pass = move
+        
+        return best_pass
     
     def _maintains_triangle(self, target_player, active_players: List, ball_new_pos) -> bool:
         """
@@ -372,7 +385,12 @@ class HeuristicTriangleFormation(BaseAgent):
             return False
         
         # Check if other players are reasonably positioned for new triangle
-        avg_distance = sum(p.position.distance(ball_new_pos) for p in other_players) / len(other_players)
+        ball_row = ball_new_pos.row
+        ball_col = ball_new_pos.col
+        avg_distance = sum(
+            max(abs(p.position.row - ball_row), abs(p.position.col - ball_col))
+            for p in other_players
+        ) / len(other_players)
         
         return abs(avg_distance - self.IDEAL_TRIANGLE_DISTANCE) < self.TRIANGLE_TOLERANCE * 2
     
@@ -380,11 +398,21 @@ class HeuristicTriangleFormation(BaseAgent):
     
     def _find_goal_moves(self, game, kick_moves: List) -> List:
         """Find kicks that score a goal."""
-        goal_moves = []
-        for move in kick_moves:
-            _, _, to_pos = move
-            if game.current_team == game.LEFT and game.is_goal_RIGHT(to_pos):
-                goal_moves.append(move)
-            elif game.current_team == game.RIGHT and game.is_goal_LEFT(to_pos):
-                goal_moves.append(move)
-        return goal_moves
\ No newline at end of file
+        team = game.current_team
+        goal_squares = self.goal_squares.get(team)
+        if goal_squares is None:
+            if team == game.LEFT:
+                is_goal = game.is_goal_RIGHT
+            elif team == game.RIGHT:
+                is_goal = game.is_goal_LEFT
+            else:
+                return []
+            goal_squares = frozenset(
+                (row, col)
+                for row in range(game.ROWS)
+                for col in range(game.COLS)
+                if is_goal(Position(row, col))
+            )
+            self.goal_squares[team] = goal_squares
+        
+        return [move for move in kick_moves if (move[2].row, move[2].col) in goal_squares]
\ No newline at end of file
@@ -110,6 +110,12 @@ class HeuristicRoleBased(BaseAgent):
         self.games_played += 1
         self.player_roles = {}  # Clear role assignments
     
+    def spawn(self):
+        """Per-session copy with its own role assignments."""
+        agent = super().spawn()
+        agent.player_roles = {}
+        return agent
+    
     def _assign_roles(self, game):
         """
         Assign roles to players based on initial positions.
@@ -4,7 +4,9 @@ These agents natively work with mastergoalGame.py (standard logic).
 """
 
 import time
+import json
 import random
+import functools
 import numpy as np
 from typing import Any, Tuple
 from agents.base_agent import BaseAgent, GameLogic
@@ -43,9 +45,6 @@ class MCTSStandardAgent(BaseAgent):
         # Import MCTS components
         try:
             from mastergoalGame import MastergoalGame
-            from mcts_AI import RootParallelMCTSAI
-            from strategies.selection import UCTSelection
-            from strategies.final_move import RobustChildStrategy
             
             # Create game instance
             self.game = MastergoalGame(level)
@@ -54,23 +53,37 @@ class MCTSStandardAgent(BaseAgent):
             self.team = None
             
             # Create MCTS AI instance
-            self.mcts_ai = RootParallelMCTSAI(
-                game=self.game,
-                AI_team=self.game.LEFT,  # Placeholder, will be updated
-                iterations=iterations,
-                selection_strategy=UCTSelection,
-                final_move_strategy=RobustChildStrategy(),
-                level=level,
-                use_opening_book=use_opening_book,
-                num_threads=num_threads,
-                exploration_constant=exploration_constant
-            )
+            self.mcts_ai = self._create_mcts_ai()
             
             self.initialized = True
             
         except ImportError as e:
             raise ImportError(f"Failed to import MCTS components: {e}")
     
+    def _create_mcts_ai(self):
+        """Build the MCTS search object (holds the per-game search state)."""
+        from mcts_AI import RootParallelMCTSAI
+        from strategies.selection import UCTSelection
+        from strategies.final_move import RobustChildStrategy
+        
+        return RootParallelMCTSAI(
+            game=self.game,
+            AI_team=self.game.LEFT,  # Placeholder, will be updated
+            iterations=self.iterations,
+            selection_strategy=UCTSelection,
+            final_move_strategy=RobustChildStrategy(),
+            level=self.level,
+            use_opening_book=self.use_opening_book,
+            num_threads=self.num_threads,
+            exploration_constant=self.exploration_constant
+        )
+    
+    def spawn(self):
+        """Per-session copy with its own search state."""
+        agent = super().spawn()
+        agent.mcts_ai = agent._create_mcts_ai()
+        return agent
+    
     def set_team(self, team: str):
         """Set the team this agent is playing as."""
         self.team = team
@@ -148,7 +161,8 @@ class MinimaxAgent(BaseAgent):
                  name: str,
                  level: int,
                  weights_file: str,
-                 depth: int = None):
+                 depth: int = None,
+                 max_tt_entries: int = 50000):
         """
         Initialize Minimax agent.
         
@@ -157,16 +171,17 @@ class MinimaxAgent(BaseAgent):
             level: Game level (1, 2, or 3)
             weights_file: Path to JSON file with evaluation weights
             depth: Minimax search depth (if None, loaded from weights_file)
+            max_tt_entries: Transposition table size of each search (one per
+                spawned agent, cleared on reset)
         """
         super().__init__(name, level, GameLogic.STANDARD)
         
         self.weights_file = weights_file
+        self.max_tt_entries = max_tt_entries
         
-        # Load weights from file
-        import json
+        # Load weights from file (parsed once per process, see _load_weights)
         try:
-            with open(weights_file, 'r') as f:
-                weights_data = json.load(f)
+            weights_data = self._load_weights(weights_file)
             
             # Extract weights and depth
             if 'weights' in weights_data:
@@ -199,7 +214,8 @@ class MinimaxAgent(BaseAgent):
             # Create game and evaluator
             self.game = MastergoalGame(level)
             self.evaluator = LinearEvaluator(level, self.weights)
-            self.minimax_ai = MinimaxAI(self.game, max_depth=self.depth, evaluator=self.evaluator)
+            self.minimax_ai = MinimaxAI(self.game, max_depth=self.depth, evaluator=self.evaluator,
+                                        max_tt_entries=self.max_tt_entries)
             
             self.team = None
             self.initialized = True
@@ -207,6 +223,16 @@ class MinimaxAgent(BaseAgent):
         except ImportError as e:
             raise ImportError(f"Failed to import Minimax components: {e}")
     
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _load_weights(weights_file: str) -> dict:
+        """
+        Parse a weights JSON file. Cached so every agent built from the same
+        file shares one parsed dict; callers must treat it as read-only.
+        """
+        with open(weights_file, 'r') as f:
+            return json.load(f)
+    
     def set_team(self, team: str):
         """Set the team this agent is playing as."""
         self.team = team
@@ -228,8 +254,8 @@ class MinimaxAgent(BaseAgent):
             # Update minimax AI's game reference
             self.minimax_ai.game = game_state
             
-            # Get best move
-            move = self.minimax_ai.get_best_move(self.team)
+            # Get best move (iterative deepening, stops early if out of time)
+            move = self.minimax_ai.get_best_move(self.team, time_limit=time_limit)
             
             thinking_time = time.time() - start_time
             
@@ -252,9 +278,19 @@ class MinimaxAgent(BaseAgent):
                 raise RuntimeError(f"No valid moves for {self.name}")
     
     def reset(self):
-        """Reset between games."""
+        """Reset between games, keeping loaded weights and evaluator."""
+        self.minimax_ai.reset()
         self.games_played += 1
     
+    def spawn(self):
+        """Per-session copy with its own search (TT, history); weights and evaluator are shared."""
+        from minimax_AI import MinimaxAI
+        
+        agent = super().spawn()
+        agent.minimax_ai = MinimaxAI(self.game, max_depth=self.depth, evaluator=self.evaluator,
+                                     max_tt_entries=self.max_tt_entries)
+        return agent
+    
     def get_stats(self) -> dict:
         """Get agent statistics."""
         stats = super().get_stats()
@@ -17,4 +17,5 @@ def clone_game(game):
         Player(Position(p.position.row, p.position.col), p.team, p.player_id, p.is_goalkeeper)
         for p in game.players
     ]
+    new_game.zobrist = game.zobrist
     return new_game
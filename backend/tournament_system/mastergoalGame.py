@@ -1,3 +1,5 @@
+import random
+
 from ball import Ball
 from player import Player
 from position import Position
@@ -6,6 +8,46 @@ from position import Position
 NUM_GOALS = 2 #Number of goals to win
 NUM_TURNS = 60 #Number of turns to play before a draw
 
+# Tipos de pieza para el hash de Zobrist
+ZOBRIST_BALL = 0
+ZOBRIST_LEFT_PLAYER = 1
+ZOBRIST_RIGHT_PLAYER = 2
+ZOBRIST_LEFT_GOALKEEPER = 3
+ZOBRIST_RIGHT_GOALKEEPER = 4
+
+# Desplazamientos de un jugador (hasta 2 casillas en línea recta o diagonal), en el
+# orden de generación original. Cada entrada: (dr, dc, casilla intermedia o None)
+PLAYER_STEPS = tuple(
+    (dr, dc, ((dr > 0) - (dr < 0), (dc > 0) - (dc < 0)) if max(abs(dr), abs(dc)) == 2 else None)
+    for dr in (-2, -1, 0, 1, 2)
+    for dc in (-2, -1, 0, 1, 2)
+    if not (dr == 0 and dc == 0) and (dr == 0 or dc == 0 or abs(dr) == abs(dc))
+)
+
+# Direcciones en las que se puede patear la pelota
+KICK_DIRECTIONS = ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1))
+
+def _build_adjacent_masks(rows, cols):
+    """Máscara de bits (bit fila * cols + columna) de las casillas adyacentes a cada casilla."""
+    masks = []
+    for row in range(rows):
+        for col in range(cols):
+            mask = 0
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    r, c = row + dr, col + dc
+                    if (dr or dc) and 0 <= r < rows and 0 <= c < cols:
+                        mask |= 1 << (r * cols + c)
+            masks.append(mask)
+    return tuple(masks)
+
+def _build_zobrist_keys(num_squares, seed=0xC0FFEE):
+    """Genera (una sola vez) las claves aleatorias de 64 bits por tipo de pieza y casilla."""
+    rng = random.Random(seed)
+    table = [[rng.getrandbits(64) for _ in range(num_squares)] for _ in range(5)]
+    side_key = rng.getrandbits(64)
+    return table, side_key
+
 class MastergoalGame:
     """Clase principal que maneja el estado del juego y las reglas."""
     # Constantes para equipos
@@ -16,6 +58,15 @@ class MastergoalGame:
     ROWS = 15
     COLS = 11
     
+    # Claves de Zobrist: ZOBRIST_TABLE[tipo_pieza][fila * COLS + columna]
+    ZOBRIST_TABLE, ZOBRIST_SIDE = _build_zobrist_keys(ROWS * COLS)
+
+    # Bitboards: la casilla (fila, columna) es el bit fila * COLS + columna
+    ADJACENT_MASKS = _build_adjacent_masks(ROWS, COLS)
+    # PLAYER_TARGETS[equipo][casilla]: destinos de un jugador que pasan los chequeos
+    # fijos (límites, córner prohibido, arco); se construye al final del módulo
+    PLAYER_TARGETS = None
+    
     def __init__(self, level=1):
         """Inicializa el juego con el nivel especificado."""
         self.level = level
@@ -28,9 +79,12 @@ class MastergoalGame:
         self.passes_count = 0  # Contador de pases en el turno actual
         self.turn_count = 0  # Contador de turnos
         self.skip_next_turn = False  # Flag para saltarse el siguiente turno (nivel 3)
+        self.zobrist = 0  # Hash de Zobrist de la posición, se actualiza de forma incremental
+        self.undo_stack = []  # Registros para deshacer jugadas hechas con make_move
         
         # Inicializa el juego según el nivel
         self.setup_game(level)
+        self.compute_zobrist()
     
     def setup_game(self, level):
         """Configura el juego según el nivel especificado."""
@@ -73,6 +127,32 @@ class MastergoalGame:
         self.current_team = self.RIGHT if self.LEFT_goals > self.RIGHT_goals else self.LEFT
         self.passes_count = 0
         self.last_possession_team = None
+        self.compute_zobrist()
+    
+    def _zobrist_piece(self, player):
+        """Devuelve el tipo de pieza de Zobrist de un jugador."""
+        if player.team == self.LEFT:
+            return ZOBRIST_LEFT_GOALKEEPER if player.is_goalkeeper else ZOBRIST_LEFT_PLAYER
+        return ZOBRIST_RIGHT_GOALKEEPER if player.is_goalkeeper else ZOBRIST_RIGHT_PLAYER
+    
+    def _zobrist_key(self, piece, position):
+        """Devuelve la clave de Zobrist de una pieza en una casilla."""
+        return self.ZOBRIST_TABLE[piece][position.row * self.COLS + position.col]
+    
+    def compute_zobrist(self):
+        """
+        Recalcula desde cero el hash de Zobrist (jugadores, pelota y equipo en turno).
+        
+        Solo es necesario cuando el estado se reemplaza por completo; los
+        movimientos y pateos lo actualizan de forma incremental.
+        """
+        h = self._zobrist_key(ZOBRIST_BALL, self.ball.position)
+        for player in self.players:
+            h ^= self._zobrist_key(self._zobrist_piece(player), player.position)
+        if self.current_team == self.RIGHT:
+            h ^= self.ZOBRIST_SIDE
+        self.zobrist = h
+        return h
     
     def is_goal_LEFT(self, position):
         """Verifica si la posición es un gol para el equipo blanco."""
@@ -137,6 +217,12 @@ class MastergoalGame:
         """Verifica si la posición es una casilla neutra."""
         if self.level == 1:
             return False     
+        if 0 <= position.row < self.ROWS and 0 <= position.col < self.COLS:
+            left_bits, right_bits = self._team_bits()
+            adjacent = self.ADJACENT_MASKS[position.row * self.COLS + position.col]
+            LEFT_adjacent = (adjacent & left_bits).bit_count()
+            RIGHT_adjacent = (adjacent & right_bits).bit_count()
+            return LEFT_adjacent > 0 and RIGHT_adjacent > 0 and LEFT_adjacent == RIGHT_adjacent
         LEFT_adjacent = 0
         RIGHT_adjacent = 0
         for player in self.players:
@@ -191,6 +277,21 @@ class MastergoalGame:
             arms.append(right_arm)
         return arms
     
+    def _occupancy(self):
+        """Devuelve un diccionario {(fila, columna): jugador} con las casillas ocupadas."""
+        return {(p.position.row, p.position.col): p for p in self.players}
+
+    def _team_bits(self):
+        """Devuelve los bitboards (LEFT, RIGHT) de las casillas ocupadas por cada equipo."""
+        left_bits = right_bits = 0
+        cols = self.COLS
+        for p in self.players:
+            if p.team == self.LEFT:
+                left_bits |= 1 << (p.position.row * cols + p.position.col)
+            else:
+                right_bits |= 1 << (p.position.row * cols + p.position.col)
+        return left_bits, right_bits
+    
     def get_legal_player_moves(self, player_position):
         """Devuelve todas las posiciones legales a las que un jugador puede moverse."""
         legal_moves = []
@@ -199,94 +300,64 @@ class MastergoalGame:
             return []
         # Verificar si el jugador está en el estado neutral de la pelota
         is_in_ball_neutral_state = self.is_player_in_ball_neutral_state(player_position)
-            
-        for dr in [-2, -1, 0, 1, 2]:
-            for dc in [-2, -1, 0, 1, 2]:
-                if dr == 0 and dc == 0:
-                    continue
-                if abs(dr) > 2 or abs(dc) > 2:
-                    continue
-                if not (dr == 0 or dc == 0 or abs(dr) == abs(dc)):
-                    continue
-
-                new_position = Position(player_position.row + dr, player_position.col + dc)
-                
-                if self.is_out_of_bounds(new_position):
-                    continue
-                if self.is_forbidden_corner(new_position, player.team):
-                    continue
-                if self.get_player_at(new_position) is not None:
-                    continue
-                if new_position == self.ball.position:
-                    continue
-                if self.is_goal_LEFT(new_position) or self.is_goal_RIGHT(new_position):
-                    continue  # No puede entrar al área de gol
-                
-                # No puede posicionarse en las casillas de brazos del arquero (CHEQUEA PARA EL ARQUEROE ESTO?)
-                if self.level == 3 and not player.is_goalkeeper:
-                    # Verificar brazos de ambos equipos
-                    LEFT_arms = self.get_goalkeeper_arms(self.LEFT)
-                    RIGHT_arms = self.get_goalkeeper_arms(self.RIGHT)
-                    if new_position in LEFT_arms or new_position in RIGHT_arms:
-                        continue
-                
-                # LÓGICA ESPECIAL PARA ARQUERO EN NIVEL 3
-                if self.level == 3 and player.is_goalkeeper:
-                    # Si el arquero se mueve a una posición dentro de su área grande,
-                    # debe verificar que tenga espacio para al menos un brazo válido
-                    if self.is_in_big_area(new_position, player.team):
-                        # Verificar que en la nueva posición tenga espacio para sus brazos
-                        potential_left_arm = Position(new_position.row, new_position.col - 1)
-                        potential_right_arm = Position(new_position.row, new_position.col + 1)
-                        
-                        # Contar cuántos brazos válidos tendría en la nueva posición
-                        valid_arms = 0
-                        
-                        # Verificar brazo izquierdo (solo si está dentro del área grande)
-                        if (not self.is_out_of_bounds(potential_left_arm) and 
-                            self.is_in_big_area(potential_left_arm, player.team) and
-                            self.get_player_at(potential_left_arm) is None and
-                            potential_left_arm != self.ball.position):
-                            valid_arms += 1
-                        
-                        # Verificar brazo derecho (solo si está dentro del área grande)
-                        if (not self.is_out_of_bounds(potential_right_arm) and 
-                            self.is_in_big_area(potential_right_arm, player.team) and
-                            self.get_player_at(potential_right_arm) is None and
-                            potential_right_arm != self.ball.position):
+        
+        cols = self.COLS
+        ball_position = self.ball.position
+        left_bits, right_bits = self._team_bits()
+        # Casillas ocupadas por jugadores o por la pelota
+        pieces = left_bits | right_bits | 1 << (ball_position.row * cols + ball_position.col)
+        blocked = pieces
+        
+        # No puede posicionarse en las casillas de brazos del arquero (CHEQUEA PARA EL ARQUEROE ESTO?)
+        # Los brazos no cambian durante la generación, se calculan una sola vez
+        if self.level == 3 and not player.is_goalkeeper:
+            for team in (self.LEFT, self.RIGHT):
+                for arm in self.get_goalkeeper_arms(team):
+                    blocked |= 1 << (arm.row * cols + arm.col)
+        
+        # Los chequeos fijos (límites, córner prohibido, arco) ya están aplicados en PLAYER_TARGETS
+        targets = self.PLAYER_TARGETS[player.team][player_position.row * cols + player_position.col]
+        for new_row, new_col, new_bit, middle_bit in targets:
+            # Casilla ocupada, con la pelota o con un brazo del arquero
+            if blocked & new_bit:
+                continue
+        
+            new_position = Position(new_row, new_col)
+        
+            # LÓGICA ESPECIAL PARA ARQUERO EN NIVEL 3
+            if self.level == 3 and player.is_goalkeeper:
+                # Si el arquero se mueve a una posición dentro de su área grande,
+                # debe verificar que tenga espacio para al menos un brazo válido
+                if self.is_in_big_area(new_position, player.team):
+                    # Contar cuántos brazos válidos tendría en la nueva posición
+                    # (solo si están dentro del área grande)
+                    valid_arms = 0
+                    for arm_col in (new_col - 1, new_col + 1):
+                        potential_arm = Position(new_row, arm_col)
+                        if (not self.is_out_of_bounds(potential_arm) and
+                            self.is_in_big_area(potential_arm, player.team) and
+                            not pieces & 1 << (new_row * cols + arm_col)):
                             valid_arms += 1
-                        
-                        # El arquero necesita al menos un brazo válido para moverse dentro del área
-                        if valid_arms == 0:
-                            continue
-                    # Si se mueve fuera del área grande, se convierte en jugador normal
-                    # y no hay restricciones adicionales
-
-                # Si el jugador está en estado neutral de la pelota, 
-                # solo puede moverse a posiciones que sigan siendo adyacentes a la pelota
-                if is_in_ball_neutral_state:
-                    if not new_position.is_adjacent(self.ball.position):
-                        continue  # Debe mantenerse adyacente a la pelota en estado neutral  
-
-                # Verifica si pasa por encima de la pelota o de otro jugador
-                # Los jugadores pueden saltar sobre los brazos del arquero a la sgte casilla
-                direction = player_position.direction_to(new_position)
-                steps = new_position.distance(player_position)
-                path_blocked = False
-                for step in range(1, steps):
-                    intermediate = player_position.position_in_direction(direction, step)
-                    if intermediate == self.ball.position:
-                        path_blocked = True
-                        break
-                    # Verificar si hay un jugador que no sea un brazo de arquero
-                    player_at_intermediate = self.get_player_at(intermediate)
-                    if player_at_intermediate is not None:
-                        path_blocked = True
-                        break
-                
-                if not path_blocked:
-                    legal_moves.append(new_position)
-      
+        
+                    # El arquero necesita al menos un brazo válido para moverse dentro del área
+                    if valid_arms == 0:
+                        continue
+                # Si se mueve fuera del área grande, se convierte en jugador normal
+                # y no hay restricciones adicionales
+        
+            # Si el jugador está en estado neutral de la pelota,
+            # solo puede moverse a posiciones que sigan siendo adyacentes a la pelota
+            if is_in_ball_neutral_state:
+                if not new_position.is_adjacent(ball_position):
+                    continue  # Debe mantenerse adyacente a la pelota en estado neutral
+        
+            # Verifica si pasa por encima de la pelota o de otro jugador
+            # Los jugadores pueden saltar sobre los brazos del arquero a la sgte casilla
+            if pieces & middle_bit:
+                continue
+        
+            legal_moves.append(new_position)
+        
         return legal_moves
 
     def get_legal_ball_kicks(self, from_position):
@@ -295,24 +366,47 @@ class MastergoalGame:
         
         if self.ball.position != from_position:
             return []
+        
+        ball_position = self.ball.position
+        team_players = self.get_team_players(self.current_team)
             
         # Verificar si hay un jugador del equipo actual adyacente a la pelota
         kicker = None
-        for player in self.get_team_players(self.current_team):
-            if player.position.is_adjacent(self.ball.position):
+        for player in team_players:
+            if player.position.is_adjacent(ball_position):
                 kicker = player
                 break
                 
         if kicker is None:
             return []
+        
+        occupied = self._occupancy()
+        opponent_team = self.RIGHT if self.current_team == self.LEFT else self.LEFT
+        
+        # Bitboards para los chequeos de adyacencia de cada destino
+        cols = self.COLS
+        adjacent_masks = self.ADJACENT_MASKS
+        left_bits, right_bits = self._team_bits()
+        own_bits, opponent_bits = (left_bits, right_bits) if self.current_team == self.LEFT else (right_bits, left_bits)
+        teammate_bits = own_bits & ~(1 << (kicker.position.row * cols + kicker.position.col))
+        
+        # Brazos del arquero rival (nivel 3), se calculan una sola vez
+        arm_squares = set()
+        if self.level == 3:
+            opponent_gk = self.get_goalkeeper(opponent_team)
+            if opponent_gk and self.is_in_big_area(opponent_gk.position, opponent_team):
+                arm_squares = {(arm.row, arm.col) for arm in self.get_goalkeeper_arms(opponent_team)}
             
         # La pelota puede moverse 1-4 casillas en línea recta
-        for direction in [(0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1)]:
+        for direction in KICK_DIRECTIONS:
+            dr, dc = direction
             for distance in range(1, 5):
-                new_position = self.ball.position.position_in_direction(direction, distance)
+                new_position = ball_position.position_in_direction(direction, distance)
+                new_square = (new_position.row, new_position.col)
+                is_goal = self.is_goal_LEFT(new_position) or self.is_goal_RIGHT(new_position)
                 
                 # Verificar fuera de límites (permitir entrar a arco)
-                if self.is_out_of_bounds(new_position) and not (self.is_goal_LEFT(new_position) or self.is_goal_RIGHT(new_position)):
+                if self.is_out_of_bounds(new_position) and not is_goal:
                     break
                 
                 # No puede patear a su propio córner
@@ -320,7 +414,7 @@ class MastergoalGame:
                     continue
                 
                 # No puede terminar en su propia área grande (salvo gol)
-                if self.is_in_big_area(new_position, kicker.team) and not (self.is_goal_LEFT(new_position) or self.is_goal_RIGHT(new_position)):
+                if self.is_in_big_area(new_position, kicker.team) and not is_goal:
                     continue
                 
                 # No puede patear a su propio arco (autogol)
@@ -331,43 +425,31 @@ class MastergoalGame:
                 # ⚽ SOLO en nivel 3: chequeo arquero y brazos
                 if self.level == 3:
                     goalkeeper_blocks = False
-                    # No pasar sobre cuerpo del arquero
                     for d in range(1, distance + 1):
-                        pos = self.ball.position.position_in_direction(direction, d)
-                        player_at_pos = self.get_player_at(pos)
+                        square = (ball_position.row + dr * d, ball_position.col + dc * d)
+                        # No pasar sobre cuerpo del arquero
+                        player_at_pos = occupied.get(square)
                         if player_at_pos and player_at_pos.is_goalkeeper:
                             goalkeeper_blocks = True
                             break
+                        # Ni sobre los brazos del arquero rival
+                        if square in arm_squares:
+                            goalkeeper_blocks = True
+                            break
                     
                     if goalkeeper_blocks:
-                        continue  # Pasa sobre arquero => no es válido
-                    
-                    # Chequeamos brazos del arquero
-                    opponent_team = self.RIGHT if self.current_team == self.LEFT else self.LEFT
-                    opponent_gk = self.get_goalkeeper(opponent_team)
-                    if opponent_gk and self.is_in_big_area(opponent_gk.position, opponent_team):
-                        arms = self.get_goalkeeper_arms(opponent_team)
-                        for d in range(1, distance + 1):
-                            pos = self.ball.position.position_in_direction(direction, d)
-                            if pos in arms:
-                                goalkeeper_blocks = True
-                                break
-                        
-                        if goalkeeper_blocks:
-                            continue  # Pasa sobre brazo => no es válido
+                        continue  # Pasa sobre arquero o brazo => no es válido
 
                 # No puede terminar en casilla ocupada
-                if self.get_player_at(new_position) is not None:
+                if new_square in occupied:
                     continue
 
                 # RESTRICCIÓN DE PASES MODIFICADA
                 # Si ya se han realizado 3 pases, no permitir otro pase
+                adjacent = adjacent_masks[new_square[0] * cols + new_square[1]]
                 is_pass = False
                 if self.level >= 2:  # Solo en niveles 2 y 3 hay pases
-                    for teammate in self.get_team_players(self.current_team):
-                        if teammate.position != kicker.position and teammate.position.is_adjacent(new_position):
-                            is_pass = True
-                            break
+                    is_pass = bool(adjacent & teammate_bits)
                 
                 if self.passes_count >= 3 and is_pass:
                     continue  # Ya se hicieron 3 pases, no permitir otro pase
@@ -378,38 +460,21 @@ class MastergoalGame:
                     if self.level == 1:
                         continue
                     # En niveles 2 y 3, solo puede hacerlo si es un pase (hay compañero adyacente)
-                    elif self.level >= 2:
-                        has_teammate_adjacent = False
-                        for teammate in self.get_team_players(self.current_team):
-                            if teammate.position != kicker.position and teammate.position.is_adjacent(new_position):
-                                has_teammate_adjacent = True
-                                break
-                        if not has_teammate_adjacent:
-                            continue  # No hay compañero adyacente, no puede patear ahí
+                    elif not is_pass:
+                        continue  # No hay compañero adyacente, no puede patear ahí
 
                 # Niveles 1: no puede quedar adyacente a oponente (excepto jugada de gol)
                 if self.level == 1:
-                    opponent_team = self.RIGHT if self.current_team == self.LEFT else self.LEFT
-                    adjacent_to_opponent = False
-                    for opponent in self.get_team_players(opponent_team):
-                        if new_position.is_adjacent(opponent.position):
-                            adjacent_to_opponent = True
-                            break
+                    adjacent_to_opponent = bool(adjacent & opponent_bits)
                     if adjacent_to_opponent:
                         # Sólo permitido si es gol
-                        if not (self.is_goal_LEFT(new_position) or self.is_goal_RIGHT(new_position)):
+                        if not is_goal:
                             continue
 
                 # Nivel 2 y 3: chequeo de casilla neutra en destino
                 if self.level in (2, 3):
-                    LEFT_adjacent = 0
-                    RIGHT_adjacent = 0
-                    for player in self.players:
-                        if player.position.is_adjacent(new_position):
-                            if player.team == self.LEFT:
-                                LEFT_adjacent += 1
-                            else:
-                                RIGHT_adjacent += 1
+                    LEFT_adjacent = (adjacent & left_bits).bit_count()
+                    RIGHT_adjacent = (adjacent & right_bits).bit_count()
                     if LEFT_adjacent + RIGHT_adjacent > 0:
                         if LEFT_adjacent != RIGHT_adjacent:
                             # Hay mayoría, veamos de quién es
@@ -446,6 +511,44 @@ class MastergoalGame:
                 
         return False
 
+    def make_move(self, move):
+        """
+        Aplica una jugada legal (tupla de get_legal_moves) guardando lo necesario
+        para deshacerla con undo_move. Permite a la búsqueda explorar sobre el
+        mismo juego en lugar de clonarlo en cada nodo.
+        """
+        self.undo_stack.append((
+            self.players,
+            [player.position for player in self.players],
+            self.ball,
+            self.ball.position,
+            self.current_team,
+            self.LEFT_goals,
+            self.RIGHT_goals,
+            self.last_possession_team,
+            self.passes_count,
+            self.turn_count,
+            self.skip_next_turn,
+            self.zobrist,
+        ))
+        move_type, from_pos, to_pos = move
+        if move_type == 'move':
+            return self.apply_move(from_pos, to_pos)
+        return self.apply_kick(to_pos)
+    
+    def undo_move(self):
+        """Deshace la última jugada hecha con make_move."""
+        (players, positions, ball, ball_position, self.current_team,
+         self.LEFT_goals, self.RIGHT_goals, self.last_possession_team,
+         self.passes_count, self.turn_count, self.skip_next_turn,
+         self.zobrist) = self.undo_stack.pop()
+        # Un gol reemplaza jugadores y pelota (setup_game): se recuperan los originales
+        self.players = players
+        for player, position in zip(players, positions):
+            player.position = position
+        self.ball = ball
+        ball.position = ball_position
+    
     def execute_move(self, player_position, new_position):
         """Ejecuta el movimiento de un jugador."""
         player = self.get_player_at(player_position)
@@ -455,7 +558,20 @@ class MastergoalGame:
             
         if new_position not in self.get_legal_player_moves(player_position):
             return False
-            
+        
+        return self.apply_move(player_position, new_position)
+    
+    def apply_move(self, player_position, new_position):
+        """
+        Aplica el movimiento de un jugador SIN validarlo.
+        
+        Solo debe usarse con jugadas obtenidas de get_legal_moves (p. ej. en
+        simulaciones), evitando volver a generar las jugadas legales.
+        """
+        player = self.get_player_at(player_position)
+        
+        piece = self._zobrist_piece(player)
+        self.zobrist ^= self._zobrist_key(piece, player.position) ^ self._zobrist_key(piece, new_position)
         player.move_to(new_position)
         
         # Si el jugador está adyacente a la pelota, debe patear
@@ -474,7 +590,15 @@ class MastergoalGame:
         """Ejecuta un pateo de la pelota."""
         if new_ball_position not in self.get_legal_ball_kicks(self.ball.position):
             return False
-            
+        
+        return self.apply_kick(new_ball_position)
+    
+    def apply_kick(self, new_ball_position):
+        """
+        Aplica un pateo de la pelota SIN validarlo.
+        
+        Solo debe usarse con jugadas obtenidas de get_legal_moves.
+        """
         # Verificar si es un gol
         if self.is_goal_LEFT(new_ball_position):
             self.LEFT_goals += 1
@@ -487,6 +611,8 @@ class MastergoalGame:
             return True
             
         # Mover la pelota
+        self.zobrist ^= (self._zobrist_key(ZOBRIST_BALL, self.ball.position)
+                         ^ self._zobrist_key(ZOBRIST_BALL, new_ball_position))
         self.ball.move_to(new_ball_position)
         
         # Verificar si es una casilla especial (nivel 3)
@@ -527,6 +653,7 @@ class MastergoalGame:
         
         # Cambiar al siguiente equipo
         self.current_team = self.RIGHT if self.current_team == self.LEFT else self.LEFT
+        self.zobrist ^= self.ZOBRIST_SIDE
         
         # Verificar si se debe saltar el siguiente turno
         if self.skip_next_turn:
@@ -601,6 +728,21 @@ class MastergoalGame:
             
         return legal_moves
     
+    def get_legal_move_set(self):
+        """
+        Devuelve las jugadas legales como frozenset, para chequear pertenencia sin recorrer la lista.
+        
+        El conjunto se arma una sola vez por posición: se guarda junto con la clave
+        (Zobrist más los contadores que afectan la generación de jugadas), así que
+        cualquier jugada aplicada lo invalida.
+        """
+        key = (self.zobrist, self.passes_count, self.skip_next_turn)
+        cache = getattr(self, '_legal_move_set_cache', None)
+        if cache is None or cache[0] != key:
+            cache = (key, frozenset(self.get_legal_moves()))
+            self._legal_move_set_cache = cache
+        return cache[1]
+    
     def print_board(self):
         """Imprime el tablero con jugadores y la pelota."""
         board = [['.' for _ in range(self.COLS)] for _ in range(self.ROWS)]
@@ -616,4 +758,36 @@ class MastergoalGame:
         print("   " + " ".join(f"{c:2}" for c in range(self.COLS)))
         for r in range(self.ROWS):
             print(f"{r:2} " + " ".join(f"{cell:2}" for cell in board[r]))
-        print(f"Score: LEFT {self.LEFT_goals} - {self.RIGHT_goals} RIGHT | Turn: {self.turn_count} | Team: {self.current_team}")
\ No newline at end of file
+        print(f"Score: LEFT {self.LEFT_goals} - {self.RIGHT_goals} RIGHT | Turn: {self.turn_count} | Team: {self.current_team}")
+
+
+def _build_player_targets():
+    """
+    Precalcula, para cada equipo y casilla, los destinos de PLAYER_STEPS que
+    pasan los chequeos que no dependen de la posición de las piezas.
+    Cada destino: (fila, columna, bit del destino, bit de la casilla intermedia o 0).
+    """
+    rules = MastergoalGame.__new__(MastergoalGame)
+    cols = MastergoalGame.COLS
+    targets = {}
+    for team in (MastergoalGame.LEFT, MastergoalGame.RIGHT):
+        per_square = []
+        for row in range(MastergoalGame.ROWS):
+            for col in range(cols):
+                square_targets = []
+                for dr, dc, middle in PLAYER_STEPS:
+                    new_position = Position(row + dr, col + dc)
+                    if rules.is_out_of_bounds(new_position):
+                        continue
+                    if rules.is_forbidden_corner(new_position, team):
+                        continue
+                    if rules.is_goal_LEFT(new_position) or rules.is_goal_RIGHT(new_position):
+                        continue  # No puede entrar al área de gol
+                    middle_bit = 1 << ((row + middle[0]) * cols + col + middle[1]) if middle is not None else 0
+                    square_targets.append((new_position.row, new_position.col,
+                                           1 << (new_position.row * cols + new_position.col), middle_bit))
+                per_square.append(tuple(square_targets))
+        targets[team] = tuple(per_square)
+    return targets
+
+MastergoalGame.PLAYER_TARGETS = _build_player_targets()
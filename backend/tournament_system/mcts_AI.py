@@ -280,6 +280,7 @@ class RootParallelMCTSAI:
             Player(Position(row, col), team, pid, gk)
             for team, pid, row, col, gk in state['players']
         ]
+        game.compute_zobrist()
 
     ## OPENING BOOK
     def _is_first_turn(self):
@@ -291,7 +292,7 @@ class RootParallelMCTSAI:
         """
         if self.level in [1, 2]:
             move = ('move', Position(4, 5), Position(6, 5))
-            if move in self.game.get_legal_moves():
+            if move in self.game.get_legal_move_set():
                 return move
             return None
 
@@ -300,7 +301,7 @@ class RootParallelMCTSAI:
                 ('move', Position(4, 3), Position(6, 5)),
                 ('move', Position(4, 7), Position(6, 5))
             ]
-            legal = self.game.get_legal_moves()
+            legal = self.game.get_legal_move_set()
             valid_moves = [move for move in options if move in legal]
             return random.choice(valid_moves) if valid_moves else None
 
@@ -541,6 +542,7 @@ class MCTSAI:
             Player(Position(p.position.row, p.position.col), p.team, p.player_id, p.is_goalkeeper)
             for p in game.players
         ]
+        new_game.zobrist = game.zobrist
         return new_game
 
     def restore_game_state(self, game, state):
@@ -558,6 +560,7 @@ class MCTSAI:
             Player(Position(row, col), team, pid, gk)
             for team, pid, row, col, gk in state['players']
         ]
+        game.compute_zobrist()
 
     ## OPENING BOOK
     def _is_first_turn(self):
@@ -569,7 +572,7 @@ class MCTSAI:
         """
         if self.level in [1, 2]:
             move = ('move', Position(4, 5), Position(6, 5))
-            if move in self.game.get_legal_moves():
+            if move in self.game.get_legal_move_set():
                 return move
             return None
 
@@ -578,7 +581,7 @@ class MCTSAI:
                 ('move', Position(4, 3), Position(6, 5)),
                 ('move', Position(4, 7), Position(6, 5))
             ]
-            legal = self.game.get_legal_moves()
+            legal = self.game.get_legal_move_set()
             valid_moves = [move for move in options if move in legal]
             return random.choice(valid_moves) if valid_moves else None
 
@@ -2,28 +2,61 @@ from ball import Ball
 from mastergoalGame import MastergoalGame
 from player import Player
 from position import Position
-from collections import defaultdict, deque
+from collections import defaultdict, deque, namedtuple
+import time
+
+# Entrada de la tabla de transposición
+TTEntry = namedtuple('TTEntry', ['depth', 'value', 'flag', 'best_move'])
+TT_EXACT, TT_LOWER, TT_UPPER = 0, 1, 2
+
+# Media anchura de la ventana de aspiración alrededor del valor de la iteración anterior
+ASPIRATION_WINDOW = 50
+# Cada cuántos nodos se consulta el reloj durante la búsqueda
+TIME_CHECK_NODES = 256
+
+
+class SearchTimeout(Exception):
+    """Se agotó el tiempo de la búsqueda iterativa."""
 
 class MinimaxAI:
     """Implementación de IA usando algoritmo Minimax con poda alfa-beta para Mastergoal."""
     
-    def __init__(self, game, max_depth=1, evaluator=None):
+    def __init__(self, game, max_depth=1, evaluator=None, max_tt_entries=50000):
         """
         Inicializa la IA con el juego y la profundidad máxima de búsqueda.
         Args:
             game: Instancia de MastergoalGame
             max_depth: Profundidad máxima de búsqueda 
             evaluator: Función de evaluación personalizada
+            max_tt_entries: Tamaño máximo de la tabla de transposición
         """
         self.game = game
         self.max_depth = max_depth
         self.evaluator = evaluator
         self.nodes_evaluated = 0
         self.pruning_count = 0
+        # Tabla de transposición: se conserva entre las jugadas de una partida
+        # (los valores solo dependen de la posición y del evaluador) y se
+        # vacía en reset para no acumular memoria partida tras partida
+        self.tt = {}
+        self.max_tt_entries = max_tt_entries
+        self.tt_hits = 0
+        # Límite de tiempo de la búsqueda en curso (None = sin límite)
+        self.deadline = None
+        # Jugadas "killer": las que produjeron un corte beta, por profundidad restante
+        self.killer_moves = defaultdict(list)
         self.position_history = defaultdict(lambda: deque(maxlen=4))  # por player_id
         self.game_state_history = deque(maxlen=8)  # Almacenar los últimos 8 estados (por ciclos)
         self.last_moves = deque(maxlen=4)  # Almacenar los últimos 4 movimientos (por ciclos)
         
+    def reset(self):
+        """Limpia el estado propio de una partida (tabla de transposición, killers, historial de ciclos)."""
+        self.tt.clear()
+        self.killer_moves.clear()
+        self.position_history.clear()
+        self.game_state_history.clear()
+        self.last_moves.clear()
+        
     def get_state_hash(self, game):
         """
         Crea un hash del estado del juego para detectar ciclos.
@@ -46,17 +79,65 @@ class MinimaxAI:
         # Unir todo en una cadena
         return "|".join(state)
         
-    def get_best_move(self, team):
+    def _tt_key(self, game, is_maximizing):
+        """Clave de la tabla de transposición para un nodo de búsqueda (usa el hash de Zobrist)."""
+        return (game.zobrist, game.passes_count, game.skip_next_turn,
+                game.LEFT_goals, game.RIGHT_goals, is_maximizing)
+    
+    def _tt_store(self, key, depth, value, flag, best_move):
+        """Guarda una entrada (reemplazo por profundidad, descarta la más antigua si está llena)."""
+        entry = self.tt.get(key)
+        if entry is not None:
+            if entry.depth > depth:
+                return
+        elif len(self.tt) >= self.max_tt_entries:
+            del self.tt[next(iter(self.tt))]
+        self.tt[key] = TTEntry(depth, value, flag, best_move)
+        
+    def _order_moves(self, moves, tt_move, depth):
+        """
+        Ordena las jugadas para mejorar la poda: primero la mejor jugada de la
+        tabla de transposición, luego las jugadas killer de esta profundidad.
+        El resto conserva el orden original.
+        """
+        front = []
+        if tt_move is not None and tt_move in moves:
+            front.append(tt_move)
+        for killer in self.killer_moves.get(depth, ()):
+            if killer not in front and killer in moves:
+                front.append(killer)
+        if not front:
+            return moves
+        return front + [move for move in moves if move not in front]
+    
+    def _store_killer(self, depth, move):
+        """Recuerda (máximo 2 por profundidad) una jugada que produjo un corte."""
+        killers = self.killer_moves[depth]
+        if move in killers:
+            return
+        killers.insert(0, move)
+        del killers[2:]
+    
+    def get_best_move(self, team, time_limit=None):
         """
         Encuentra y devuelve la mejor jugada para el equipo dado.
+        
+        Usa profundización iterativa (profundidad 1 hasta max_depth) con ventanas
+        de aspiración: cada iteración empieza por la mejor jugada de la anterior y
+        deja la tabla de transposición preparada para la siguiente. Si se agota
+        el tiempo se devuelve la jugada de la última iteración completa.
         Args:
             team: Equipo para el que se busca la mejor jugada (MastergoalGame.LEFT o MastergoalGame.RIGHT)
+            time_limit: Tiempo máximo en segundos (None = buscar siempre hasta max_depth)
         Returns:
             La mejor jugada en formato (tipo, posición_origen, posición_destino)
         """
+        start_time = time.time()
         # Reiniciar contadores para estadísticas
         self.nodes_evaluated = 0
         self.pruning_count = 0
+        self.tt_hits = 0
+        self.killer_moves.clear()
         
         # Guardar el estado original del juego
         original_state = self.game.get_game_state()
@@ -73,34 +154,67 @@ class MinimaxAI:
         is_in_cycle = len(self.game_state_history) == self.game_state_history.maxlen and \
                      len(set(self.game_state_history)) <= 3
         
-        best_move = None
-        best_value = float('-inf') if team == self.game.LEFT else float('inf')
-        alpha = float('-inf')
-        beta = float('inf')
-        
         all_moves = self.game.get_legal_moves()
         # To do, not yet: detectar ciclos y eliminar de mov valido tal vez?
         moves = all_moves
+        
+        # Si alguna jugada resulta en un gol, devolverla directamente (Darle un valor?)
         for move in moves:
-            # Crear una copia del juego para simular la jugada
-            game_copy = self.clone_game(self.game)
             move_type, from_pos, to_pos = move
-            if move_type == 'move':
-                game_copy.execute_move(from_pos, to_pos)
-            else:  # kick
-                game_copy.execute_kick(to_pos)
-                # Comprobar inmediatamente si la jugada resulta en un gol
-                if (game_copy.is_goal_LEFT(to_pos)) or \
-               (game_copy.is_goal_RIGHT(to_pos)):
-                    # Si la jugada resulta en un gol, devolver esta jugada (Darle un valor?)
-                    self.restore_game_state(self.game, original_state)
-                    return move
-                
+            if move_type == 'kick' and (self.game.is_goal_LEFT(to_pos) or self.game.is_goal_RIGHT(to_pos)):
+                return move
+        
+        # Una sola copia del juego: la búsqueda aplica y deshace jugadas sobre ella
+        game_copy = self.clone_game(self.game)
+        best_move = None
+        best_value = None
+        for depth in range(1, self.max_depth + 1):
+            # La profundidad 1 siempre se completa para tener una jugada
+            self.deadline = start_time + time_limit if time_limit is not None and depth > 1 else None
+            try:
+                if best_value is None:
+                    move, value = self._search_root(game_copy, moves, depth, team, is_in_cycle,
+                                                    float('-inf'), float('inf'))
+                else:
+                    alpha, beta = best_value - ASPIRATION_WINDOW, best_value + ASPIRATION_WINDOW
+                    move, value = self._search_root(game_copy, moves, depth, team, is_in_cycle, alpha, beta)
+                    # Fuera de la ventana: repetir con ventana completa
+                    if value <= alpha or value >= beta:
+                        move, value = self._search_root(game_copy, moves, depth, team, is_in_cycle,
+                                                        float('-inf'), float('inf'))
+            except SearchTimeout:
+                # La copia queda a medio buscar; se descarta
+                break
+            best_move, best_value = move, value
+            # La mejor jugada de esta iteración se busca primero en la siguiente
+            if best_move is not None:
+                moves = [best_move] + [m for m in moves if m != best_move]
+        self.deadline = None
+        
+        # To do, not yet: (ciclos) Guardar el movimiento elegido en el historial
+        
+        # Restaurar el estado original del juego
+        self.restore_game_state(self.game, original_state)
+        
+        return best_move
+    
+    def _search_root(self, game, moves, depth, team, is_in_cycle, alpha, beta):
+        """
+        Busca todas las jugadas de la raíz a la profundidad dada dentro de (alpha, beta).
+        Returns:
+            (mejor jugada, su valor)
+        """
+        best_move = None
+        best_value = float('-inf') if team == game.LEFT else float('inf')
+        
+        for move in moves:
             # Evaluar la jugada con minimax
-            move_value = self.minimax(game_copy, self.max_depth - 1, alpha, beta, False if team == self.game.LEFT else True)
-            
+            game.make_move(move)
+            move_value = self.minimax(game, depth - 1, alpha, beta, False if team == game.LEFT else True)
+            game.undo_move()
+        
             # Actualizar la mejor jugada
-            if team == self.game.LEFT:
+            if team == game.LEFT:
                 if move_value > best_value or (move_value == best_value and is_in_cycle and move not in self.last_moves):
                     best_value = move_value
                     best_move = move
@@ -110,18 +224,13 @@ class MinimaxAI:
                     best_value = move_value
                     best_move = move
                 beta = min(beta, best_value)
-
+        
             # Poda alfa-beta
             if beta <= alpha:
                 self.pruning_count += 1
                 break
         
-        # To do, not yet: (ciclos) Guardar el movimiento elegido en el historial
-              
-        # Restaurar el estado original del juego
-        self.restore_game_state(self.game, original_state)
-        
-        return best_move
+        return best_move, best_value
         
     def minimax(self, game, depth, alpha, beta, is_maximizing):
         """
@@ -136,9 +245,9 @@ class MinimaxAI:
             Valor de la mejor jugada encontrada
         """
         self.nodes_evaluated += 1
-        
-        # Obtener el hash del estado actual para detección de ciclos locales
-        state_hash = self.get_state_hash(game)
+        if self.deadline is not None and self.nodes_evaluated % TIME_CHECK_NODES == 0 \
+                and time.time() > self.deadline:
+            raise SearchTimeout()
         
         # Verificar si el juego ha terminado o se alcanzó la profundidad máxima
         winner = game.get_winner()
@@ -146,68 +255,96 @@ class MinimaxAI:
             return 10000  # Victoria para blanco
         elif winner == game.RIGHT:
             return -10000  # Victoria para rojo
-        elif depth == 0:
-            return self.evaluator.evaluate(game)
+        
+        # Ventana original: los flags que se guardan se comparan contra ella,
+        # no contra la ventana ya ajustada por la tabla
+        alpha_orig, beta_orig = alpha, beta
+        
+        # Consultar la tabla de transposición
+        tt_key = self._tt_key(game, is_maximizing)
+        entry = self.tt.get(tt_key)
+        tt_move = entry.best_move if entry is not None else None
+        if entry is not None and entry.depth >= depth:
+            self.tt_hits += 1
+            if entry.flag == TT_EXACT:
+                return entry.value
+            if entry.flag == TT_LOWER:
+                alpha = max(alpha, entry.value)
+            else:
+                beta = min(beta, entry.value)
+            if beta <= alpha:
+                return entry.value
+        
+        if depth == 0:
+            value = self.evaluator.evaluate(game)
+            self._tt_store(tt_key, 0, value, TT_EXACT, None)
+            return value
             
         moves = game.get_legal_moves()
         # No hay más jugadas posibles
         if not moves:
             return 0
-            
+        moves = self._order_moves(moves, tt_move, depth)
+        
+        best_move = None
         if is_maximizing:
-            max_eval = float('-inf')
+            best_eval = float('-inf')
             for move in moves:
-                # Crear una copia del juego para simular la jugada
-                game_copy = self.clone_game(game)
-                
-                # Ejecutar la jugada en la copia
-                move_type, from_pos, to_pos = move
-                if move_type == 'move':
-                    game_copy.execute_move(from_pos, to_pos)
-                else:  # kick
-                    game_copy.execute_kick(to_pos)
+                # Aplicar la jugada sobre el mismo juego (se deshace después)
+                game.make_move(move)
                 
                 # Comprobar si esta jugada resulta en una victoria inmediata para el maximizador (LEFT)
-                if game_copy.get_winner() == game.LEFT:
-                    return 10000  # Devolver inmediatamente un valor muy alto
+                if game.get_winner() == game.LEFT:
+                    game.undo_move()
+                    best_eval, best_move = 10000, move  # Valor máximo posible, no seguir buscando
+                    break
                     
                 # Evaluar recursivamente
-                eval_value = self.minimax(game_copy, depth - 1, alpha, beta, False)
-                max_eval = max(max_eval, eval_value)
+                eval_value = self.minimax(game, depth - 1, alpha, beta, False)
+                game.undo_move()
+                if eval_value > best_eval:
+                    best_eval, best_move = eval_value, move
                 
                 # Actualizar alfa
                 alpha = max(alpha, eval_value)
                 if beta <= alpha:
                     self.pruning_count += 1
+                    self._store_killer(depth, move)
                     break
-            return max_eval
         else:
-            min_eval = float('inf')
+            best_eval = float('inf')
             for move in moves:
-                # Crear una copia del juego para simular la jugada
-                game_copy = self.clone_game(game)
-                
-                # Ejecutar la jugada en la copia
-                move_type, from_pos, to_pos = move
-                if move_type == 'move':
-                    game_copy.execute_move(from_pos, to_pos)
-                else:  # kick
-                    game_copy.execute_kick(to_pos)
+                # Aplicar la jugada sobre el mismo juego (se deshace después)
+                game.make_move(move)
                 
                 # Comprobar si esta jugada resulta en una victoria inmediata para el minimizador (RIGHT)
-                if game_copy.get_winner() == game.RIGHT:
-                    return -10000  # Devolver inmediatamente un valor muy bajo
+                if game.get_winner() == game.RIGHT:
+                    game.undo_move()
+                    best_eval, best_move = -10000, move  # Valor mínimo posible, no seguir buscando
+                    break
                     
                 # Evaluar recursivamente
-                eval_value = self.minimax(game_copy, depth - 1, alpha, beta, True)
-                min_eval = min(min_eval, eval_value)
+                eval_value = self.minimax(game, depth - 1, alpha, beta, True)
+                game.undo_move()
+                if eval_value < best_eval:
+                    best_eval, best_move = eval_value, move
                 
                 # Actualizar beta
                 beta = min(beta, eval_value)
                 if beta <= alpha:
                     self.pruning_count += 1
+                    self._store_killer(depth, move)
                     break
-            return min_eval
+        
+        # Guardar el resultado: cota superior, cota inferior o valor exacto
+        if best_eval <= alpha_orig:
+            flag = TT_UPPER
+        elif best_eval >= beta_orig:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+        self._tt_store(tt_key, depth, best_eval, flag, best_move)
+        return best_eval
     
     def track_player_position(self, player):
         """Registra la posición actual del jugador en su historial."""
@@ -254,7 +391,8 @@ class MinimaxAI:
                 player.is_goalkeeper
             )
             new_game.players.append(new_player)
-            
+        
+        new_game.zobrist = game.zobrist
         return new_game
         
     def restore_game_state(self, game, state):
@@ -283,4 +421,6 @@ class MinimaxAI:
         for player_data in state['players']:
             team, player_id, row, col, is_goalkeeper = player_data
             player = Player(Position(row, col), team, player_id, is_goalkeeper)
-            game.players.append(player)
\ No newline at end of file
+            game.players.append(player)
+        
+        game.compute_zobrist()
\ No newline at end of file
@@ -0,0 +1,23 @@
+from position import Position
+
+# Codificación compacta de jugadas en un entero:
+# tipo << 20 | fila_origen << 15 | col_origen << 10 | fila_destino << 5 | col_destino
+# (5 bits por coordenada, suficiente para el tablero de 15x11)
+MOVE_TYPE_CODES = {'move': 0, 'kick': 1}
+MOVE_TYPE_NAMES = ('move', 'kick')
+_COORD_MASK = 0x1F
+
+
+def encode_move(move_type, from_pos, to_pos):
+    """Codifica una jugada (tipo, posición_origen, posición_destino) como entero."""
+    return (MOVE_TYPE_CODES[move_type] << 20 | from_pos.row << 15 | from_pos.col << 10
+            | to_pos.row << 5 | to_pos.col)
+
+
+def decode_move(code):
+    """Decodifica un entero de encode_move a la tupla (tipo, posición_origen, posición_destino)."""
+    return (
+        MOVE_TYPE_NAMES[code >> 20],
+        Position(code >> 15 & _COORD_MASK, code >> 10 & _COORD_MASK),
+        Position(code >> 5 & _COORD_MASK, code & _COORD_MASK),
+    )
@@ -1,5 +1,8 @@
 class Position:
     """Representa una posición en el tablero con fila y columna."""
+    # Sin __dict__ por instancia: se crean muchas durante la generación de jugadas
+    __slots__ = ('row', 'col')
+    
     def __init__(self, row, col):
         self.row = row
         self.col = col
@@ -25,7 +25,7 @@ from agents.heuristic_agent_level2 import HeuristicAgentLevel2
 from agents.heuristic_agent_level2_territorial import HeuristicTerritorialControl
 
 
-def register_level1_agents(manager: TournamentManager):
+def register_level1_agents(manager: TournamentManager, reuse_tree: bool = False):
     """Register agents for Level 1 tournament."""
     print("\nRegistering Level 1 agents...")
     
@@ -59,7 +59,8 @@ def register_level1_agents(manager: TournamentManager):
             checkpoint_path=r"C:\Users\Amparo\Documents\AAA-TESTING-AGENTS\tournament-system-Mastergoal\12_03\best.pth.tar",  # ACTUALIZAR RUTA
             num_mcts_sims=400,
             cpuct=2.0,
-            temp=0.0
+            temp=0.0,
+            reuse_tree=reuse_tree
         )
         manager.register_agent(
             agent=az_agent,
@@ -446,6 +447,8 @@ def main():
                        help='Quick test mode (4 games, level 1)')
     parser.add_argument('--all-levels', action='store_true',
                        help='Run tournaments for all levels')
+    parser.add_argument('--tree-reuse', action='store_true',
+                       help='Keep the AlphaZero MCTS tree across games (bounded)')
     
     args = parser.parse_args()
     
@@ -489,7 +492,7 @@ def main():
         
         # Register agents based on level
         if level == 1:
-            register_level1_agents(manager)
+            register_level1_agents(manager, reuse_tree=args.tree_reuse)
         elif level == 2:
             register_level2_agents(manager)
         elif level == 3:
@@ -6,23 +6,46 @@ class SimulationStrategy:
     def simulate(self, node):
         raise NotImplementedError
 
+def rollout(game, AI_team, max_plies=None):
+    """
+    Play random legal moves on `game` (modified in place) until someone wins,
+    there are no moves left or `max_plies` moves have been played (no limit
+    if None).
+    
+    Moves come from get_legal_moves, so they are applied without re-validation.
+    
+    Returns:
+        1.0 if AI_team won, -1.0 if the opponent won, 0.0 otherwise
+    """
+    plies = 0
+    while game.get_winner() is None:
+        if max_plies is not None and plies >= max_plies:
+            break
+        plies += 1
+        moves = game.get_legal_moves()
+        if not moves:
+            break
+        move_type, from_pos, to_pos = random.choice(moves)
+        if move_type == 'move':
+            game.apply_move(from_pos, to_pos)
+        else:
+            game.apply_kick(to_pos)
+    
+    winner = game.get_winner()
+    if winner == AI_team:
+        return 1.0
+    elif winner is None:
+        return 0.0
+    else:
+        return -1.0
+
 class RandomPlayout(SimulationStrategy):
-    def __init__(self, AI_team):
+    def __init__(self, AI_team, max_plies=None):
         self.AI_team = AI_team
+        self.max_plies = max_plies
 
     def simulate(self, node):
-        game = clone_game(node.game_state)
-        while game.get_winner() is None:
-            moves = game.get_legal_moves()
-            if not moves:
-                break
-            move = random.choice(moves)
-            move_type, from_pos, to_pos = move
-            if move_type == 'move':
-                game.execute_move(from_pos, to_pos)
-            else:
-                game.execute_kick(to_pos)
-        return self.calculate_reward(game)
+        return rollout(clone_game(node.game_state), self.AI_team, self.max_plies)
 
     def calculate_reward(self, game):
         winner = game.get_winner()
@@ -1,5 +1,42 @@
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:5000';
 
+const PACKED_MOVE_TYPES = ['move', 'kick'];
+
+// Decode base64 legal moves: 5 bytes per move (type, fromRow, fromCol, toRow, toCol)
+export function decodePackedMoves(encoded) {
+  const bytes = Uint8Array.from(atob(encoded || ''), (c) => c.charCodeAt(0));
+  const moves = [];
+  for (let i = 0; i + 4 < bytes.length; i += 5) {
+    moves.push({
+      type: PACKED_MOVE_TYPES[bytes[i]],
+      from: { row: bytes[i + 1], col: bytes[i + 2] },
+      to: { row: bytes[i + 3], col: bytes[i + 4] },
+    });
+  }
+  return moves;
+}
+
+// Expand a gameState sent with layout=soa (parallel arrays) into the nested shape the UI uses
+export function expandGameState(gameState) {
+  if (!gameState || gameState.layout !== 'soa') return gameState;
+  const { players: p, legalMoves: m } = gameState;
+  return {
+    ...gameState,
+    layout: 'nested',
+    players: p.teams.map((team, i) => ({
+      team,
+      id: p.ids[i],
+      position: { row: p.rows[i], col: p.cols[i] },
+      isGoalkeeper: p.goalkeepers[i],
+    })),
+    legalMoves: m.types.map((type, i) => ({
+      type,
+      from: { row: m.fromRows[i], col: m.fromCols[i] },
+      to: { row: m.toRows[i], col: m.toCols[i] },
+    })),
+  };
+}
+
 class GameAPI {
   constructor() {
     this.baseURL = API_BASE_URL;
@@ -52,9 +89,11 @@ class GameAPI {
   }
 
   async getGameState(gameId) {
-    return this.request(`/api/game/${gameId}/state`, {
+    // Fetched with the compact parallel-array layout and expanded here
+    const data = await this.request(`/api/game/${gameId}/state?layout=soa`, {
       method: 'GET',
     });
+    return data ? { ...data, gameState: expandGameState(data.gameState) } : data;
   }
 
   async makeMove(gameId, move) {
@@ -64,12 +103,36 @@ class GameAPI {
     });
   }
 
+  // Poll the result of a move made with { asyncAi: true }
+  async getAiStatus(gameId) {
+    return this.request(`/api/game/${gameId}/ai-status`, {
+      method: 'GET',
+    });
+  }
+
+  async getMoveHistory(gameId, offset = 0, limit = 50) {
+    return this.request(`/api/game/${gameId}/history?offset=${offset}&limit=${limit}`, {
+      method: 'GET',
+    });
+  }
+
   async getLegalMoves(gameId) {
     return this.request(`/api/game/${gameId}/legal-moves`, {
       method: 'GET',
     });
   }
 
+  // Same as getLegalMoves, using the compact packed encoding on the wire
+  async getLegalMovesPacked(gameId) {
+    const data = await this.request(`/api/game/${gameId}/legal-moves?format=packed`, {
+      method: 'GET',
+    });
+    return {
+      ...data,
+      legalMoves: decodePackedMoves(data.legalMovesPacked),
+    };
+  }
+
   async restartGame(gameId) {
     return this.request(`/api/game/${gameId}/restart`, {
       method: 'POST',